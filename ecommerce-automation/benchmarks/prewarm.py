@@ -0,0 +1,81 @@
+# benchmarks/prewarm.py - First-navigation Navigation Timing with and without connection pre-warming
+"""
+Starts a fresh headless browser per run, optionally pre-warms the
+platform's origins, waits as long as startup plus the session check
+usually take, then navigates to the storefront home page and reads its
+Navigation Timing:
+
+    python -m benchmarks.prewarm --runs 10
+    python -m benchmarks.prewarm --platform flipkart --delay 1.5
+
+This talks to the real storefront origin (or AMAZON_BASE_URL), since
+DNS/TCP/TLS setup to localhost costs next to nothing.
+"""
+import argparse
+import asyncio
+import sys
+from statistics import median
+
+from config.settings import PLATFORMS
+from performance_monitor import PerformanceMonitor
+from src.browser_manager import AdvancedBrowserManager
+
+METRICS = ('dns_ms', 'connect_ms', 'ttfb_ms', 'server_ms', 'dom_content_loaded_ms')
+
+
+async def first_navigation(platform, prewarm, delay):
+    config = PLATFORMS[platform]
+    origins = [config['base_url']] + config.get('asset_hosts', [])
+    manager = AdvancedBrowserManager()
+    manager.monitor = PerformanceMonitor()
+    try:
+        await manager.start_browser(persistent=False, headless=True, warm_origins=origins if prewarm else None)
+        # Stand-in for the work that overlaps with pre-warming in the real flow
+        await asyncio.sleep(delay)
+        manager.monitor.start_operation('first_navigation')
+        await manager.safe_navigate(config['base_url'] + '/', timeout=20000)
+        timings = manager.monitor.current_attributes.get('navigation_timing', [])
+        manager.monitor.end_operation()
+        return timings[0] if timings else None
+    finally:
+        await manager.close_browser()
+
+
+async def run(platform, runs, delay):
+    results = {False: [], True: []}
+    for run_number in range(1, runs + 1):
+        # Alternate so both modes see the same network conditions on average
+        for prewarm in ((False, True) if run_number % 2 else (True, False)):
+            timing = await first_navigation(platform, prewarm, delay)
+            if timing:
+                results[prewarm].append(timing)
+    return results
+
+
+def print_report(results):
+    print("\n" + "="*64)
+    print("🔥 FIRST NAVIGATION: COLD vs PRE-WARMED (median ms)")
+    print("="*64)
+    print(f"{'Metric':<24}{'cold':>12}{'pre-warmed':>14}{'saved':>12}")
+    for metric in METRICS:
+        cold = [t[metric] for t in results[False] if t.get(metric) is not None]
+        warm = [t[metric] for t in results[True] if t.get(metric) is not None]
+        if not cold or not warm:
+            continue
+        print(f"{metric:<24}{median(cold):>12.1f}{median(warm):>14.1f}{median(cold) - median(warm):>12.1f}")
+    print(f"\nRuns: {len(results[False])} cold, {len(results[True])} pre-warmed")
+    print("="*64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the gain of connection pre-warming")
+    parser.add_argument('--platform', default='amazon', choices=sorted(PLATFORMS))
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--delay', type=float, default=1.0, help="Seconds between start and first navigation")
+    args = parser.parse_args(argv)
+    print_report(asyncio.run(run(args.platform, args.runs, args.delay)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
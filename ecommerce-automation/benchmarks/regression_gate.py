@@ -0,0 +1,165 @@
+# benchmarks/regression_gate.py - Statistical performance regression gate for the checkout flow
+"""
+Runs the checkout flow repeatedly against the local stand-in storefront and
+either records the per-phase timing distributions as a baseline or compares
+a fresh sample against it.
+
+    python -m benchmarks.regression_gate record --runs 20
+    python -m benchmarks.regression_gate check --runs 20
+
+A phase regresses when its timings are significantly larger than the
+baseline (one-sided Mann-Whitney U test) AND its median grew by more than
+the configured tolerance. `check` exits with 1 on a regression and 2 when
+runs failed or no baseline exists.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from statistics import median
+
+# The storefront origin is read when config.settings is imported, so point it
+# at the stand-in before anything imports the flow.
+STOREFRONT_PORT = int(os.getenv('BENCH_STOREFRONT_PORT', '8765'))
+os.environ['AMAZON_BASE_URL'] = f"http://127.0.0.1:{STOREFRONT_PORT}"
+
+from config.settings import REGRESSION_GATE
+from benchmarks.stats import mann_whitney_greater, bootstrap_median_diff
+from benchmarks.storefront import StandInStorefront
+
+BENCH_PRODUCT_PATH = '/dp/B0BENCH001'
+TOTAL_PHASE = 'total'
+
+
+def collect_samples(runs, latency=0.0, flow_options=None):
+    """Run the flow `runs` times and return ({phase: [seconds]}, failed_runs)"""
+    from main import ReliableEcommerceAutomation
+    from performance_monitor import PerformanceMonitor
+
+    options = {**REGRESSION_GATE['flow_options'], **(flow_options or {})}
+    samples = {}
+    failed = 0
+    with StandInStorefront(STOREFRONT_PORT, latency) as storefront:
+        product_url = storefront.base_url + BENCH_PRODUCT_PATH
+        for run in range(1, runs + 1):
+            print(f"\n🏁 Benchmark run {run}/{runs}")
+            monitor = PerformanceMonitor()
+            automation = ReliableEcommerceAutomation(options=options, monitor=monitor)
+            checkout_url = asyncio.run(automation.automate_checkout(product_url))
+            if not checkout_url:
+                failed += 1
+                continue
+            for phase, duration in monitor.get_phase_durations().items():
+                samples.setdefault(phase, []).append(duration)
+            samples.setdefault(TOTAL_PHASE, []).append(monitor.get_total_time())
+    return samples, failed
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, samples, runs, options):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    baseline = {
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'runs': runs,
+        'flow_options': options,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'phases': samples,
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def compare(baseline_phases, candidate_phases, config):
+    """Compare per-phase distributions; returns a list of row dicts"""
+    rows = []
+    for phase in sorted(set(baseline_phases) | set(candidate_phases)):
+        base = baseline_phases.get(phase, [])
+        new = candidate_phases.get(phase, [])
+        row = {'phase': phase, 'base_n': len(base), 'new_n': len(new), 'verdict': 'ok'}
+        if len(base) < config['min_samples'] or len(new) < config['min_samples']:
+            row['verdict'] = 'too few samples'
+            rows.append(row)
+            continue
+        base_median, new_median = median(base), median(new)
+        _, p_value = mann_whitney_greater(base, new)
+        ci_low, ci_high = bootstrap_median_diff(
+            base, new, config['confidence'], config['bootstrap_samples']
+        )
+        delta = new_median - base_median
+        relative = delta / base_median if base_median > 0 else 0.0
+        row.update(base_median=base_median, new_median=new_median, delta=delta,
+                   relative=relative, ci=(ci_low, ci_high), p_value=p_value)
+        if (p_value < config['alpha'] and relative > config['tolerance']
+                and delta > config['min_delta']):
+            row['verdict'] = 'REGRESSION'
+        rows.append(row)
+    return rows
+
+
+def print_report(rows, config):
+    print("\n" + "="*92)
+    print(f"📊 REGRESSION GATE (alpha={config['alpha']}, tolerance={config['tolerance']:.0%}, "
+          f"CI={config['confidence']:.0%})")
+    print("="*92)
+    print(f"{'Phase':<20}{'Base p50':>10}{'New p50':>10}{'Δ':>9}{'Δ%':>8}  {'CI of Δ':<20}{'p':>8}  Verdict")
+    for row in rows:
+        if 'p_value' not in row:
+            print(f"{row['phase']:<20}{'':>10}{'':>10}{'':>9}{'':>8}  {'':<20}{'':>8}  "
+                  f"{row['verdict']} ({row['base_n']}/{row['new_n']})")
+            continue
+        ci = f"[{row['ci'][0]:+.3f}, {row['ci'][1]:+.3f}]"
+        marker = "❌" if row['verdict'] == 'REGRESSION' else "✅"
+        print(f"{row['phase']:<20}{row['base_median']:>10.3f}{row['new_median']:>10.3f}"
+              f"{row['delta']:>+9.3f}{row['relative']:>+8.1%}  {ci:<20}{row['p_value']:>8.4f}  "
+              f"{marker} {row['verdict']}")
+    print("="*92)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checkout flow performance regression gate")
+    parser.add_argument('command', choices=['record', 'check'])
+    parser.add_argument('--runs', type=int, default=REGRESSION_GATE['runs'])
+    parser.add_argument('--baseline', default=REGRESSION_GATE['baseline_file'])
+    parser.add_argument('--alpha', type=float, default=REGRESSION_GATE['alpha'])
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_GATE['tolerance'])
+    parser.add_argument('--latency', type=float, default=0.0, help="Stand-in server delay per request in seconds")
+    args = parser.parse_args(argv)
+    config = {**REGRESSION_GATE, 'alpha': args.alpha, 'tolerance': args.tolerance}
+
+    if args.command == 'check' and not os.path.exists(args.baseline):
+        print(f"❌ No baseline at {args.baseline}; run `record` first")
+        return 2
+
+    samples, failed = collect_samples(args.runs, args.latency)
+    if failed:
+        print(f"❌ {failed}/{args.runs} benchmark runs failed")
+        return 2
+
+    if args.command == 'record':
+        save_baseline(args.baseline, samples, args.runs, REGRESSION_GATE['flow_options'])
+        print(f"✅ Baseline with {args.runs} runs written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(baseline['phases'], samples, config)
+    print_report(rows, config)
+    regressions = [row['phase'] for row in rows if row['verdict'] == 'REGRESSION']
+    if regressions:
+        print(f"❌ Regressed phases: {', '.join(regressions)}")
+        return 1
+    print("🎉 No phase regressed beyond tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
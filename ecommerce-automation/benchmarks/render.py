@@ -0,0 +1,106 @@
+# benchmarks/render.py - Renderer work per page type, default vs lean render profile
+"""
+Loads each page type of the local stand-in storefront (served with an
+animated carousel, spinners and a large footer, like real storefront pages)
+in a headless browser with the default and with the lean render profile,
+and compares the renderer's own work over the load plus a settle window:
+
+    python -m benchmarks.render --runs 10
+    python -m benchmarks.render --runs 5 --settle 2.0
+
+Work comes from the DevTools Performance domain (task, script, layout and
+style time, layout count), render_ms from Navigation Timing
+(responseEnd to DOMContentLoaded end).
+"""
+import argparse
+import asyncio
+import os
+import sys
+from statistics import median
+
+STOREFRONT_PORT = int(os.getenv('BENCH_STOREFRONT_PORT', '8765'))
+os.environ['AMAZON_BASE_URL'] = f"http://127.0.0.1:{STOREFRONT_PORT}"
+
+from benchmarks.storefront import StandInStorefront
+from src.browser_manager import AdvancedBrowserManager, NAVIGATION_TIMING_SCRIPT
+from src.renderer_metrics import RendererMetrics, cumulative_deltas
+
+MODES = ('default', 'lean')
+PAGE_TYPES = {
+    'home': '/',
+    'product': '/dp/B0BENCH001',
+    'cart': '/gp/cart/view.html',
+    'checkout': '/checkout/entry',
+}
+METRICS = ('task_ms', 'script_ms', 'layout_ms', 'style_ms', 'layouts', 'render_ms')
+
+
+async def measure_mode(base_url, mode, settle):
+    """One browser in `mode`; returns {page type: {metric: value}}"""
+    manager = AdvancedBrowserManager()
+    try:
+        await manager.start_browser(persistent=False, headless=True, lean_render=mode == 'lean')
+        # Put an item in the cart so the cart page has content
+        await manager.safe_navigate(base_url + '/gp/aws/cart/add.html?ASIN.1=B0BENCH001&Quantity.1=1')
+        metrics = RendererMetrics(monitor=None)
+        results = {}
+        for page_type, path in PAGE_TYPES.items():
+            before = await metrics.snapshot(manager.page)
+            await manager.safe_navigate(base_url + path)
+            # Let animations and deferred work run like they would while the flow looks for elements
+            await asyncio.sleep(settle)
+            after = await metrics.snapshot(manager.page)
+            if before is None or after is None:
+                raise RuntimeError("DevTools Performance metrics unavailable")
+            row = cumulative_deltas(before['values'], after['values'])
+            timing = await manager.page.evaluate(NAVIGATION_TIMING_SCRIPT) or {}
+            row['render_ms'] = timing.get('render_ms')
+            results[page_type] = row
+        return results
+    finally:
+        await manager.close_browser()
+
+
+async def run(runs, settle):
+    samples = {mode: {page_type: {metric: [] for metric in METRICS} for page_type in PAGE_TYPES} for mode in MODES}
+    with StandInStorefront(STOREFRONT_PORT, decorations=True) as storefront:
+        for run_number in range(1, runs + 1):
+            # Alternate the order so neither mode always runs on a warmer machine
+            for mode in (MODES if run_number % 2 else tuple(reversed(MODES))):
+                for page_type, row in (await measure_mode(storefront.base_url, mode, settle)).items():
+                    for metric in METRICS:
+                        if row.get(metric) is not None:
+                            samples[mode][page_type][metric].append(row[metric])
+                print(f"🏁 Run {run_number}/{runs} {mode}")
+    return samples
+
+
+def print_report(samples):
+    print("\n" + "="*72)
+    print("🖥️ RENDER WORK PER PAGE TYPE: default vs lean (median)")
+    print("="*72)
+    print(f"{'Page':<10}{'Metric':<12}{'default':>12}{'lean':>12}{'saved':>12}{'saved %':>12}")
+    for page_type in PAGE_TYPES:
+        for metric in METRICS:
+            default = samples['default'][page_type][metric]
+            lean = samples['lean'][page_type][metric]
+            if not default or not lean:
+                continue
+            base, candidate = median(default), median(lean)
+            share = f"{(base - candidate) / base:>12.1%}" if base else f"{'-':>12}"
+            print(f"{page_type:<10}{metric:<12}{base:>12.1f}{candidate:>12.1f}{base - candidate:>12.1f}{share}")
+        print()
+    print("="*72)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure renderer work with and without the lean render profile")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--settle', type=float, default=1.0, help="Seconds to stay on each page after it loads")
+    args = parser.parse_args(argv)
+    print_report(asyncio.run(run(args.runs, args.settle)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,548 @@
+# benchmarks/simulator.py - Browser-free latency simulator for the checkout flow
+"""
+Runs the real flow logic in main.py against a fake Playwright page whose
+latencies and page states are drawn from the distributions in
+SIMULATOR (config/settings.py). Time is virtual: the event loop jumps
+straight to the next timer, so thousands of checkouts take seconds.
+
+    python -m benchmarks.simulator --runs 2000
+    python -m benchmarks.simulator --runs 2000 --toggle direct_add_to_cart skip_cart_page
+    python -m benchmarks.simulator --runs 2000 --login-orders
+
+Only the subset of the Page API the flow uses is implemented. Parsing done
+on worker threads (fetch_page) takes no virtual time.
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import math
+import os
+import random
+import selectors
+import sys
+from contextlib import asynccontextmanager
+from statistics import mean, median
+from urllib.parse import urlparse, parse_qs
+
+# Point the Amazon config at a fake origin before the flow is imported
+SIM_ORIGIN = 'http://sim.storefront'
+os.environ['AMAZON_BASE_URL'] = SIM_ORIGIN
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from config.settings import SIMULATOR
+from benchmarks.storefront import PAGE, NAV_BAR, PRODUCT_BODY, CART_BODY, CHECKOUT_BODY
+from performance_monitor import PerformanceMonitor
+from src.browser_manager import AdvancedBrowserManager
+
+SIM_PRODUCT_URL = SIM_ORIGIN + '/dp/B0SIMUL001'
+TOTAL_PHASE = 'total'
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class VirtualTimeSelector(selectors.DefaultSelector):
+    """Instead of sleeping until the next timer, advance the virtual clock to it"""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout=None):
+        ready = super().select(0)
+        if ready or timeout == 0:
+            return ready
+        if timeout is None:
+            # Nothing scheduled: only real I/O (worker threads) can wake the loop
+            return super().select(None)
+        self.clock.now += timeout
+        return []
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock):
+        super().__init__(VirtualTimeSelector(clock))
+        self.clock = clock
+
+    def time(self):
+        return self.clock()
+
+
+class Latencies:
+    def __init__(self, config, rng):
+        self.config = config
+        self.rng = rng
+
+    def sample(self, kind):
+        median_seconds, sigma = self.config[kind]
+        return self.rng.lognormvariate(math.log(median_seconds), sigma)
+
+
+class SimulatedStorefront:
+    """Page states of the stand-in storefront, with scripted failures.
+
+    resolve() follows redirects and returns (url, status, elements, html);
+    `elements` maps each selector present on the page to its text, and
+    click_target() says where a click on one of them navigates.
+    """
+
+    def __init__(self, probabilities, rng):
+        self.probabilities = probabilities
+        self.rng = rng
+        self.cart = []
+        self.authenticated = rng.random() >= probabilities['session_expired']
+        self.down_paths = {path for path in ('/ap/signin', '/gp/sign-in.html', '/')
+                           if rng.random() < probabilities['entry_point_down']}
+
+    def chance(self, name):
+        return self.rng.random() < self.probabilities[name]
+
+    def _nav(self):
+        greeting = 'Hello, Bench Account' if self.authenticated else 'Hello, sign in'
+        elements = {
+            '#nav-link-accountList': greeting,
+            '#nav-cart': 'Cart',
+            '#nav-cart-count': str(len(self.cart)),
+        }
+        if not self.authenticated:
+            elements['a[data-nav-role="signin"]'] = 'Sign in'
+        return elements
+
+    def _page(self, title, body, elements):
+        nav = NAV_BAR.format(count=len(self.cart))
+        if not self.authenticated:
+            nav = nav.replace('Hello, Bench Account', 'Hello, sign in')
+        return {**self._nav(), **elements}, PAGE.format(title=title, nav=nav, body=body)
+
+    def resolve(self, url):
+        for _ in range(5):
+            parsed = urlparse(url)
+            path, query = parsed.path or '/', parse_qs(parsed.query)
+            redirect = self._redirect(path, query)
+            if redirect is None:
+                break
+            url = SIM_ORIGIN + redirect
+        if path in self.down_paths:
+            return url, None, {}, ''
+        if path == '/gp/aws/cart/add.html' and self.chance('direct_add_fails'):
+            return url, 503, {}, 'Service Unavailable'
+        elements, html = self._render(path, query)
+        return url, 200, elements, html
+
+    def _redirect(self, path, query):
+        if path == '/ap/signin/submit':
+            self.authenticated = True
+            return '/'
+        if path == '/gp/cart/desktop/go-to-checkout.html':
+            if not self.cart or self.chance('checkout_bounce'):
+                return '/gp/cart/view.html'
+            return '/checkout/entry'
+        if path.startswith('/checkout') and not self.authenticated:
+            return '/ap/signin'
+        if path in ('/ap/signin', '/gp/sign-in.html') and self.authenticated:
+            return '/'
+        return None
+
+    def _render(self, path, query):
+        if path in ('/ap/signin', '/gp/sign-in.html'):
+            return self._page('Sign in', '<form id="signin"></form>', {
+                '#ap_email': '', 'input[name="email"]': '', '#continue': 'Continue'
+            })
+        if path == '/ap/signin/password':
+            return self._page('Sign in', '<form id="signin"></form>', {
+                '#ap_password': '', 'input[name="password"]': '', 'input[type="password"]': '',
+                '#signInSubmit': 'Sign in'
+            })
+        if path.startswith('/dp/'):
+            asin = path.split('/')[2]
+            return self._page(asin, PRODUCT_BODY.format(asin=asin, filler=''), {
+                '#productTitle': f'Bench product {asin}', '#add-to-cart-button': 'Add to Cart'
+            })
+        if path == '/gp/aws/cart/add.html':
+            asin = query.get('ASIN.1', [''])[0]
+            if asin:
+                self.cart.append(asin)
+            return self._page('Cart add', f'<div class="card" id="huc"><h1>Added to Cart</h1>{asin}</div>', {
+                '#huc': 'Added to Cart'
+            })
+        if path in ('/gp/cart/view.html', '/cart'):
+            items = ''.join(f'<div class="sc-list-item" data-asin="{a}">{a}</div>' for a in self.cart)
+            elements = {'[data-name="Active Items"]': '', 'input[name="proceedToRetailCheckout"]': ''}
+            if self.cart:
+                elements['[data-name="Active Items"] .sc-list-item'] = self.cart[0]
+            return self._page('Cart', CART_BODY.format(items=items), elements)
+        if path.startswith('/checkout'):
+            return self._page('Checkout', CHECKOUT_BODY, {
+                '#address-list': 'Bench Account', 'input[name="add-new-address"]': ''
+            })
+        return self._page('Home', '<div class="card">Welcome back</div>', {})
+
+    def click_target(self, path, selector):
+        """URL a click on `selector` navigates to, if any"""
+        if selector in ('#continue', 'input[id="continue"]') and path in ('/ap/signin', '/gp/sign-in.html'):
+            return SIM_ORIGIN + '/ap/signin/password'
+        if selector in ('#signInSubmit', 'input[id="signInSubmit"]'):
+            return SIM_ORIGIN + '/ap/signin/submit'
+        if selector in ('#nav-link-accountList', 'a[data-nav-role="signin"]') and not self.authenticated:
+            return SIM_ORIGIN + '/ap/signin'
+        if selector == '#add-to-cart-button' and path.startswith('/dp/'):
+            return SIM_ORIGIN + f"/gp/aws/cart/add.html?ASIN.1={path.split('/')[2]}&Quantity.1=1"
+        if selector == 'input[name="proceedToRetailCheckout"]':
+            return SIM_ORIGIN + '/checkout/entry'
+        return None
+
+
+class FakeResponse:
+    def __init__(self, url, status, body):
+        self.url = url
+        self.status = status
+        self.ok = 200 <= status < 300
+        self._body = body
+
+    async def text(self):
+        return self._body
+
+
+class FakeRequest:
+    def __init__(self, context):
+        self.context = context
+
+    async def get(self, url, timeout=30000):
+        latency = self.context.latencies.sample('request')
+        final_url, status, _, html = self.context.site.resolve(url)
+        if status is None or latency * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError(f"Request timed out after {timeout}ms: {url}")
+        await asyncio.sleep(latency)
+        return FakeResponse(final_url, status, html)
+
+
+class FakeContext:
+    def __init__(self, site, latencies):
+        self.site = site
+        self.latencies = latencies
+        self.request = FakeRequest(self)
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def storage_state(self):
+        return {'cookies': [], 'origins': []}
+
+    def on(self, event, handler):
+        pass  # No page subresources are simulated
+
+    async def close(self):
+        self.pages = []
+
+
+class FakeKeyboard:
+    def __init__(self, page):
+        self.page = page
+
+    async def press(self, key):
+        await asyncio.sleep(self.page.latencies.sample('click'))
+
+    async def type(self, text):
+        await asyncio.sleep(self.page.latencies.sample('fill'))
+
+
+class FakeMouse:
+    async def move(self, x, y):
+        pass
+
+
+class FakeElement:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def get_attribute(self, name):
+        return None
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    async def count(self):
+        await asyncio.sleep(self.page.latencies.sample('query'))
+        return 1 if self.page.find(self.selector) else 0
+
+    async def text_content(self, timeout=30000):
+        await self.page.wait_for_selector(self.selector, timeout=timeout)
+        return self.page.elements[self.page.find(self.selector)]
+
+    async def click(self, timeout=30000):
+        await self.page.click(self.selector, timeout=timeout)
+
+
+class FakePage:
+    """The subset of playwright.async_api.Page used by the flow, on a simulated storefront"""
+
+    def __init__(self, context):
+        self.context = context
+        self.latencies = context.latencies
+        self.url = 'about:blank'
+        self.elements = {}
+        self.html = ''
+        self.navigations = 0
+        self.keyboard = FakeKeyboard(self)
+        self.mouse = FakeMouse()
+        self.closed = False
+
+    def find(self, selector):
+        """The first part of a selector list present on the page, or None"""
+        for part in selector.split(','):
+            if part.strip() in self.elements:
+                return part.strip()
+        return None
+
+    async def _load(self, url, timeout):
+        latency = self.latencies.sample('navigation')
+        final_url, status, elements, html = self.context.site.resolve(url)
+        if status is None or latency * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded navigating to {url}")
+        await asyncio.sleep(latency)
+        self.url, self.elements, self.html = final_url, elements, html
+        self.navigations += 1
+
+    async def goto(self, url, wait_until='load', timeout=30000):
+        await self._load(url, timeout)
+
+    async def reload(self, timeout=30000):
+        await self._load(self.url, timeout)
+
+    async def wait_for_selector(self, selector, timeout=30000):
+        if not self.find(selector):
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded waiting for {selector}")
+        await asyncio.sleep(self.latencies.sample('selector'))
+        return FakeElement(self, selector)
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    async def query_selector_all(self, selector):
+        await asyncio.sleep(self.latencies.sample('query'))
+        return []
+
+    async def click(self, selector, timeout=30000):
+        await self.wait_for_selector(selector, timeout=timeout)
+        await asyncio.sleep(self.latencies.sample('click'))
+        target = self.context.site.click_target(urlparse(self.url).path, self.find(selector))
+        if target:
+            await self._load(target, 30000)
+
+    async def fill(self, selector, value, timeout=30000):
+        await self.wait_for_selector(selector, timeout=timeout)
+        await asyncio.sleep(self.latencies.sample('fill'))
+
+    async def type(self, selector, text, delay=0, timeout=30000):
+        await self.wait_for_selector(selector, timeout=timeout)
+        await asyncio.sleep(len(text) * delay / 1000)
+
+    async def evaluate(self, expression):
+        return None  # No rendering, so no performance entries
+
+    async def content(self):
+        await asyncio.sleep(self.latencies.sample('query'))
+        return self.html
+
+    @asynccontextmanager
+    async def expect_navigation(self, timeout=30000):
+        started, before = asyncio.get_running_loop().time(), self.navigations
+        yield
+        if self.navigations == before:
+            waited = asyncio.get_running_loop().time() - started
+            await asyncio.sleep(max(0.0, timeout / 1000 - waited))
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded waiting for navigation")
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def unroute(self, pattern):
+        pass
+
+    async def add_init_script(self, script):
+        pass
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class SimulatedBrowserManager(AdvancedBrowserManager):
+    """AdvancedBrowserManager whose browser is a FakeContext; everything above the Page API is the real code"""
+
+    def __init__(self, site, latencies):
+        super().__init__()
+        self.site = site
+        self.latencies = latencies
+
+    async def _start_browser(self, persistent, headless, storage_state, warm_origins=None):
+        await asyncio.sleep(self.latencies.sample('startup_persistent' if persistent else 'startup_fresh'))
+        self.context = FakeContext(self.site, self.latencies)
+        self.page = await self.context.new_page()
+        await self._prepare_page(self.page)
+        return self.page
+
+    async def close_browser(self):
+        if self.context:
+            await self.context.close()
+
+
+def login_order_variant(order):
+    """Automation class whose login entry points are tried in `order` (indices into the default list)"""
+    from main import ReliableEcommerceAutomation
+
+    class OrderedLogin(ReliableEcommerceAutomation):
+        def login_urls(self):
+            urls = super().login_urls()
+            return [urls[index] for index in order]
+
+    return OrderedLogin
+
+
+async def simulate(runs, options, seed, clock, automation_class=None):
+    """Run `runs` simulated checkouts; returns ({phase: [seconds]}, {failed step: count})"""
+    from main import ReliableEcommerceAutomation
+
+    automation_class = automation_class or ReliableEcommerceAutomation
+    rng = random.Random(seed)
+    samples, failures = {}, {}
+    for _ in range(runs):
+        # The flow's own jitter (click and typing pauses) uses the global generator
+        random.seed(rng.random())
+        latencies = Latencies(SIMULATOR['latency'], rng)
+        site = SimulatedStorefront(SIMULATOR['probabilities'], rng)
+        monitor = PerformanceMonitor(clock=clock)
+        automation = automation_class(
+            options=options, monitor=monitor,
+            browser_manager=SimulatedBrowserManager(site, latencies), clock=clock
+        )
+        started = clock()
+        await automation.automate_checkout(SIM_PRODUCT_URL)
+        if automation.result['status'] != 'success':
+            step = automation.result.get('failed_step') or automation.result['status']
+            failures[step] = failures.get(step, 0) + 1
+            continue
+        for phase, duration in monitor.get_phase_durations().items():
+            samples.setdefault(phase, []).append(duration)
+        samples.setdefault(TOTAL_PHASE, []).append(clock() - started)
+    return samples, failures
+
+
+def run_variants(variants, runs, seed):
+    """Simulate each (name, options, automation class) with the same seed, so variants see the same draws"""
+    clock = VirtualClock()
+    loop = VirtualTimeEventLoop(clock)
+    results = {}
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for name, options, automation_class in variants:
+                results[name] = loop.run_until_complete(
+                    simulate(runs, options, seed, clock, automation_class)
+                )
+    finally:
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+    return results
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def print_critical_path(name, samples, failures, runs):
+    print("\n" + "="*72)
+    print(f"🧪 SIMULATED CHECKOUTS: {name} ({runs} runs)")
+    print("="*72)
+    total = samples.get(TOTAL_PHASE, [])
+    if not total:
+        print(f"❌ No run succeeded; failures: {failures}")
+        return
+    total_mean = mean(total)
+    print(f"{'Phase':<22}{'runs':>6}{'mean':>9}{'p50':>9}{'p90':>9}{'share':>9}")
+    phases = sorted((p for p in samples if p != TOTAL_PHASE), key=lambda p: sum(samples[p]), reverse=True)
+    for phase in phases + [TOTAL_PHASE]:
+        values = samples[phase]
+        # Share of the average successful run spent in this phase
+        share = sum(values) / len(total) / total_mean
+        print(f"{phase:<22}{len(values):>6}{mean(values):>9.3f}{median(values):>9.3f}"
+              f"{percentile(values, 0.9):>9.3f}{share:>9.1%}")
+    failed = sum(failures.values())
+    if failed:
+        details = ', '.join(f"{step} {count}" for step, count in sorted(failures.items(), key=lambda item: -item[1]))
+        print(f"❌ {failed}/{runs} runs failed: {details}")
+    print("="*72)
+
+
+def print_comparison(results):
+    print("\n" + "="*72)
+    print("⚖️ VARIANTS (successful runs)")
+    print("="*72)
+    print(f"{'Variant':<34}{'ok':>6}{'p50':>9}{'p90':>9}{'mean':>9}")
+    for name, (samples, failures) in results.items():
+        total = samples.get(TOTAL_PHASE, [])
+        if not total:
+            print(f"{name:<34}{0:>6}")
+            continue
+        print(f"{name:<34}{len(total):>6}{median(total):>9.3f}{percentile(total, 0.9):>9.3f}{mean(total):>9.3f}")
+    print("="*72)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate checkout runs without a browser")
+    parser.add_argument('--runs', type=int, default=SIMULATOR['runs'])
+    parser.add_argument('--seed', type=int, default=SIMULATOR['seed'])
+    parser.add_argument('--toggle', nargs='*', default=[], metavar='OPTION',
+                        help="Boolean FLOW_OPTIONS to flip, one variant each")
+    parser.add_argument('--login-orders', action='store_true',
+                        help="Compare every ordering of the login entry points")
+    args = parser.parse_args(argv)
+
+    from config.settings import FLOW_OPTIONS
+    base = {**SIMULATOR['flow_options']}
+    variants = [('baseline', base, None)]
+    for option in args.toggle:
+        if not isinstance(FLOW_OPTIONS.get(option), bool):
+            print(f"❌ {option} is not a boolean flow option")
+            return 2
+        flipped = not base.get(option, FLOW_OPTIONS[option])
+        variants.append((f"{option}={flipped}", {**base, option: flipped}, None))
+    if args.login_orders:
+        for order in itertools.permutations(range(3)):
+            variants.append((f"login order {order}", base, login_order_variant(order)))
+
+    results = run_variants(variants, args.runs, args.seed)
+    print_critical_path('baseline', *results['baseline'], args.runs)
+    if len(results) > 1:
+        print_comparison(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# benchmarks/startup.py - Browser startup: persistent profile vs fresh context from saved session state
+"""
+Measures how long it takes to get from nothing to an authenticated page in
+both startup modes, against the local stand-in storefront:
+
+    python -m benchmarks.startup --runs 10
+
+`persistent` launches from a temporary copy of the on-disk user_data/
+profile, so the benchmark starts from a realistically sized profile without
+touching the real one; `session_state` launches a plain browser and a new
+context seeded from the encrypted storage state. The state is exported once
+from a persistent run and encrypted with a throwaway key, so no real
+session is involved.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from statistics import median
+
+STOREFRONT_PORT = int(os.getenv('BENCH_STOREFRONT_PORT', '8765'))
+os.environ['AMAZON_BASE_URL'] = f"http://127.0.0.1:{STOREFRONT_PORT}"
+
+from benchmarks.storefront import StandInStorefront
+from src.browser_manager import AdvancedBrowserManager
+from src.session_store import SessionStore
+
+ACCOUNT_INDICATOR = '#nav-link-accountList'
+PROFILE_DIR = 'user_data'
+MODES = ('persistent', 'session_state')
+
+
+def copy_profile(temp_dir):
+    """Throwaway copy of the persistent profile (empty when there is none), without lock files"""
+    profile = os.path.join(temp_dir, 'user_data')
+    if os.path.isdir(PROFILE_DIR):
+        shutil.copytree(PROFILE_DIR, profile, symlinks=True, ignore=shutil.ignore_patterns('Singleton*'))
+    else:
+        os.makedirs(profile)
+    return profile
+
+
+async def start_once(base_url, mode, store, profile, headless=True):
+    """One cold start; returns (launch seconds, launch-to-authenticated-page seconds)"""
+    manager = AdvancedBrowserManager()
+    manager.user_data_dir = profile
+    started = time.perf_counter()
+    try:
+        if mode == 'persistent':
+            await manager.start_browser(persistent=True, headless=headless)
+        else:
+            await manager.start_browser(persistent=False, headless=headless, storage_state=store.load())
+        launched = time.perf_counter()
+        await manager.safe_navigate(base_url + '/')
+        await manager.wait_for_element(ACCOUNT_INDICATOR, timeout=5000)
+        ready = time.perf_counter()
+        return launched - started, ready - started
+    finally:
+        await manager.close_browser()
+
+
+async def seed_state(base_url, store, profile, headless=True):
+    """Export a storage state from a persistent-profile session with the stand-in's cookies"""
+    manager = AdvancedBrowserManager()
+    manager.user_data_dir = profile
+    try:
+        await manager.start_browser(persistent=True, headless=headless)
+        await manager.safe_navigate(base_url + '/')
+        store.save(await manager.export_storage_state())
+    finally:
+        await manager.close_browser()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(runs, headless=True):
+    results = {mode: {'launch': [], 'ready': []} for mode in MODES}
+    with tempfile.TemporaryDirectory() as temp_dir, StandInStorefront(STOREFRONT_PORT) as storefront:
+        store = SessionStore(os.path.join(temp_dir, 'state.enc'), SessionStore.generate_key())
+        profile = copy_profile(temp_dir)
+        await seed_state(storefront.base_url, store, profile, headless)
+        for run_number in range(1, runs + 1):
+            # Alternate the order so neither mode always starts with warm OS caches
+            modes = MODES if run_number % 2 else tuple(reversed(MODES))
+            for mode in modes:
+                launch, ready = await start_once(storefront.base_url, mode, store, profile, headless)
+                results[mode]['launch'].append(launch)
+                results[mode]['ready'].append(ready)
+                print(f"🏁 Run {run_number}/{runs} {mode:<14} launch {launch:.3f}s, ready {ready:.3f}s")
+    return results
+
+
+def print_report(results):
+    print("\n" + "="*72)
+    print("🚀 BROWSER STARTUP (seconds)")
+    print("="*72)
+    print(f"{'Mode':<16}{'Metric':<10}{'min':>10}{'p50':>10}{'p90':>10}{'max':>10}")
+    for mode, metrics in results.items():
+        for metric, values in metrics.items():
+            print(f"{mode:<16}{metric:<10}{min(values):>10.3f}{median(values):>10.3f}"
+                  f"{percentile(values, 0.9):>10.3f}{max(values):>10.3f}")
+    base = median(results['persistent']['ready'])
+    fresh = median(results['session_state']['ready'])
+    if base > 0:
+        print(f"\n⚡ session_state reaches an authenticated page {base - fresh:+.3f}s faster "
+              f"({(base - fresh) / base:+.1%}) at the median")
+    print("="*72)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare browser startup modes")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--headed', action='store_true', help="Show the browser windows")
+    args = parser.parse_args(argv)
+    print_report(asyncio.run(run(args.runs, headless=not args.headed)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
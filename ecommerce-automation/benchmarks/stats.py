@@ -0,0 +1,59 @@
+# benchmarks/stats.py - Small dependency-free statistics for benchmark comparisons
+import math
+import random
+from statistics import NormalDist, median
+from typing import List, Sequence, Tuple
+
+
+def mann_whitney_greater(baseline: Sequence[float], candidate: Sequence[float]) -> Tuple[float, float]:
+    """One-sided Mann-Whitney U test that candidate tends to be larger than baseline.
+
+    Returns (U statistic of the candidate sample, p-value). Uses the normal
+    approximation with tie correction and continuity correction, which is
+    adequate from roughly 8 samples per side.
+    """
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return 0.0, 1.0
+
+    pooled = sorted([(value, 0) for value in baseline] + [(value, 1) for value in candidate])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = average_rank
+        tied = j - i + 1
+        tie_term += tied ** 3 - tied
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2
+    mean_u = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - mean_u - 0.5) / math.sqrt(variance)
+    return u, 1 - NormalDist().cdf(z)
+
+
+def bootstrap_median_diff(baseline: Sequence[float], candidate: Sequence[float],
+                          confidence: float = 0.95, samples: int = 2000,
+                          seed: int = 0) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval of median(candidate) - median(baseline)"""
+    rng = random.Random(seed)
+    diffs: List[float] = []
+    for _ in range(samples):
+        b = [rng.choice(baseline) for _ in baseline]
+        c = [rng.choice(candidate) for _ in candidate]
+        diffs.append(median(c) - median(b))
+    diffs.sort()
+    tail = (1 - confidence) / 2
+    low = diffs[int(tail * (samples - 1))]
+    high = diffs[int(math.ceil((1 - tail) * (samples - 1)))]
+    return low, high
@@ -0,0 +1,176 @@
+# benchmarks/storefront.py - Local stand-in storefront for benchmark runs
+"""
+Serves just enough Amazon-shaped markup for the checkout flow in main.py to
+run end to end against localhost: an authenticated homepage, product pages,
+the cart add endpoint, the cart page and a checkout page. Cart contents live
+in a cookie so the browser context and its request API share them.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+NAV_BAR = """
+<div id="nav-belt">
+  <a id="nav-link-accountList" href="/">Hello, Bench Account</a>
+  <a id="nav-cart" href="/gp/cart/view.html">Cart <span id="nav-cart-count">{count}</span></a>
+</div>
+"""
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>body {{ font-family: sans-serif; }} .card {{ padding: 12px; margin: 8px; box-shadow: 0 1px 3px #999; }}</style>
+</head><body>{nav}{body}</body></html>"""
+
+PRODUCT_BODY = """
+<div class="card" id="dp">
+  <h1 id="productTitle">Bench product {asin}</h1>
+  <form method="get" action="/gp/aws/cart/add.html">
+    <input type="hidden" name="ASIN.1" value="{asin}">
+    <input type="hidden" name="Quantity.1" value="1">
+    <input id="add-to-cart-button" name="submit.add-to-cart" type="submit" value="Add to Cart">
+  </form>
+  {filler}
+</div>
+"""
+
+CART_BODY = """
+<div class="card" data-name="Active Items">
+  {items}
+  <form method="get" action="/checkout/entry">
+    <input name="proceedToRetailCheckout" type="submit" value="Proceed to checkout">
+  </form>
+</div>
+"""
+
+# Optional page furniture like a real storefront's: an animated carousel, spinners, fading
+# badges and a large footer below the fold (StandInStorefront(decorations=True))
+DECORATIONS = """
+<style>
+@keyframes bench-spin { to { transform: rotate(360deg); } }
+@keyframes bench-slide { from { margin-left: 0; } to { margin-left: 240px; } }
+.bench-spinner { display: inline-block; width: 20px; height: 20px; border: 3px solid #ccc;
+                 border-top-color: #333; border-radius: 50%%; animation: bench-spin 0.8s linear infinite; }
+.bench-slide { position: relative; padding: 8px; animation: bench-slide 2s ease-in-out infinite alternate; }
+.bench-badge { transition: opacity 0.6s, transform 0.6s; }
+#navFooter a { display: inline-block; width: 180px; margin: 2px; }
+</style>
+<div id="bench-carousel">%s</div>
+<div>%s</div>
+<div id="navFooter">%s</div>
+""" % (
+    ''.join(f'<div class="bench-slide card">Deal {i}</div>' for i in range(8)),
+    ''.join('<span class="bench-spinner"></span><span class="bench-badge">New</span>' for _ in range(12)),
+    ''.join(f'<a href="/">Footer link {i}</a>' for i in range(400)),
+)
+
+CHECKOUT_BODY = """
+<div class="card" id="checkout">
+  <h1>Checkout</h1>
+  <div id="address-list"><div class="address">Bench Account, 1 Bench Street, 560001</div></div>
+  <input type="button" name="add-new-address" value="Add a new address">
+  <input type="submit" name="placeYourOrder1" value="Place your order">
+</div>
+"""
+
+
+class StorefrontHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    filler_blocks = 50
+    decorations = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def _cart(self):
+        for part in self.headers.get('Cookie', '').split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == 'bench-cart' and value:
+                return value.split('.')
+        return []
+
+    def _send(self, title, body, cart, status=200):
+        if self.decorations:
+            body += DECORATIONS
+        html = PAGE.format(title=title, nav=NAV_BAR.format(count=len(cart)), body=body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(html)))
+        self.send_header('Set-Cookie', f"bench-cart={'.'.join(cart)}; Path=/")
+        self.end_headers()
+        self.wfile.write(html)
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        cart = self._cart()
+
+        if url.path in ('/', '/ap/signin', '/gp/sign-in.html'):
+            self._send('Home', '<div class="card">Welcome back</div>', cart)
+        elif url.path.startswith('/dp/'):
+            asin = url.path.split('/')[2]
+            filler = ''.join(f'<p class="bullet">Feature {i} of {asin}</p>' for i in range(self.filler_blocks))
+            self._send(asin, PRODUCT_BODY.format(asin=asin, filler=filler), cart)
+        elif url.path == '/gp/aws/cart/add.html':
+            asin = query.get('ASIN.1', [''])[0]
+            if asin:
+                cart = cart + [asin]
+            self._send('Cart add', f'<div class="card" id="huc"><h1>Added to Cart</h1>{asin}</div>', cart)
+        elif url.path in ('/gp/cart/view.html', '/cart'):
+            items = ''.join(f'<div class="sc-list-item" data-asin="{a}">{a}</div>' for a in cart)
+            self._send('Cart', CART_BODY.format(items=items), cart)
+        elif url.path == '/gp/cart/desktop/go-to-checkout.html':
+            # Like the real entry point: checkout with items, back to the cart without
+            self.send_response(302)
+            self.send_header('Location', '/checkout/entry' if cart else '/gp/cart/view.html')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif url.path.startswith('/checkout'):
+            self._send('Checkout', CHECKOUT_BODY, cart)
+        else:
+            self._send('Not found', '<div class="card">Not found</div>', cart, status=404)
+
+
+class StandInStorefront:
+    """Runs the stand-in storefront on a background thread"""
+
+    def __init__(self, port=8765, latency=0.0, decorations=False):
+        handler = type('BoundStorefrontHandler', (StorefrontHandler,), {'latency': latency, 'decorations': decorations})
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the stand-in storefront")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Server delay per request in seconds")
+    args = parser.parse_args()
+    storefront = StandInStorefront(args.port, args.latency)
+    print(f"🏪 Stand-in storefront on {storefront.base_url} (set AMAZON_BASE_URL to use it)")
+    try:
+        storefront.server.serve_forever()
+    except KeyboardInterrupt:
+        storefront.stop()
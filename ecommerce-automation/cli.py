@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Non-interactive entry point for scripted and scheduled runs.
+
+    python cli.py URL [URL ...] --profile ci --output result.json
+
+Never prompts. Writes a JSON result per product URL (status, checkout URL,
+per-phase timings) to --output ('-' for stdout, in which case progress
+output goes to stderr) and exits with one of the EXIT_* codes below; with
+several URLs the first failing run decides the exit code.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+
+from config.settings import FLOW_PROFILES
+from performance_monitor import PerformanceMonitor
+from src.platform_detector import PlatformDetector
+
+EXIT_OK = 0
+EXIT_ERROR = 1              # Unexpected exception inside the flow
+EXIT_USAGE = 2              # Bad arguments, unknown profile or unsupported URL
+EXIT_BROWSER = 3            # Browser failed to start
+EXIT_LOGIN = 4
+EXIT_ADD_TO_CART = 5
+EXIT_CART = 6               # Cart page showed no items
+EXIT_CHECKOUT = 7
+EXIT_BUDGET = 8             # Deadline used up
+
+STEP_EXIT_CODES = {
+    'browser_start': EXIT_BROWSER,
+    'login': EXIT_LOGIN,
+    'product_page': EXIT_ADD_TO_CART,
+    'add_to_cart': EXIT_ADD_TO_CART,
+    'cart_page': EXIT_CART,
+    'checkout': EXIT_CHECKOUT,
+}
+
+
+def exit_code_for(result):
+    if result['status'] == 'success':
+        return EXIT_OK
+    if result['status'] == 'budget_exhausted':
+        return EXIT_BUDGET
+    # A step that raised still names its failure class; EXIT_ERROR is for errors outside the steps
+    return STEP_EXIT_CODES.get(result.get('failed_step'), EXIT_ERROR)
+
+
+async def run_all(product_urls, options, profile='default'):
+    from main import ReliableEcommerceAutomation
+
+    runs = []
+    for product_url in product_urls:
+        monitor = PerformanceMonitor()
+        automation = ReliableEcommerceAutomation(options=options, monitor=monitor, profile=profile)
+        await automation.automate_checkout(product_url)
+        run = {
+            'product_url': product_url,
+            **automation.result,
+            'total_seconds': round(monitor.get_total_time(), 3),
+            'phases': {phase: round(seconds, 3) for phase, seconds in monitor.get_phase_durations().items()},
+            'counters': dict(monitor.counters),
+        }
+        run['exit_code'] = exit_code_for(run)
+        runs.append(run)
+    return runs
+
+
+def write_output(path, payload):
+    text = json.dumps(payload, indent=2, default=str)
+    if path == '-':
+        print(text)
+        return
+    with open(path, 'w') as f:
+        f.write(text + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the checkout flow without prompts and report JSON")
+    parser.add_argument('urls', nargs='+', metavar='URL', help="Product URLs, run one after another")
+    parser.add_argument('--profile', default='default', help=f"Options profile: {', '.join(FLOW_PROFILES)}")
+    parser.add_argument('--output', default='-', help="Result file, '-' for stdout")
+    parser.add_argument('--deadline', type=float, help="End-to-end deadline per URL in seconds")
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--metrics-port', type=int, help="Serve OpenMetrics on this port while the runs last")
+    parser.add_argument('--trace', action='store_true', help="Export each run as an OTLP JSON trace")
+    parser.add_argument('--cpu-profile', action='store_true',
+                        help="Sample the flow's Python stacks; writes collapsed stacks and a hotspot summary")
+    args = parser.parse_args(argv)
+
+    if args.profile not in FLOW_PROFILES:
+        print(f"❌ Unknown profile {args.profile!r}", file=sys.stderr)
+        return EXIT_USAGE
+    for url in args.urls:
+        try:
+            PlatformDetector.detect_platform(url)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return EXIT_USAGE
+
+    options = {**FLOW_PROFILES[args.profile], 'interactive': False}
+    if args.deadline is not None:
+        options['deadline_seconds'] = args.deadline
+    if args.headless:
+        options['headless'] = True
+    if args.metrics_port:
+        options['metrics_port'] = args.metrics_port
+    if args.trace:
+        options['trace_export'] = True
+    if args.cpu_profile:
+        options['cpu_profile'] = True
+
+    # Keep stdout clean for the JSON document
+    progress = sys.stderr if args.output == '-' else sys.stdout
+    with contextlib.redirect_stdout(progress):
+        runs = asyncio.run(run_all(args.urls, options, args.profile))
+    exit_code = next((run['exit_code'] for run in runs if run['exit_code'] != EXIT_OK), EXIT_OK)
+    write_output(args.output, {'profile': args.profile, 'exit_code': exit_code, 'runs': runs})
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
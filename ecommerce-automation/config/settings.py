@@ -3,11 +3,14 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Storefront origin, overridable to point the flow at a local stand-in storefront
+AMAZON_BASE_URL = os.getenv('AMAZON_BASE_URL', 'https://www.amazon.in').rstrip('/')
+
 # Platform configurations
 PLATFORMS = {
     'amazon': {
-        'base_url': 'https://www.amazon.in',
-        'login_url': 'https://www.amazon.in/ap/signin',
+        'base_url': AMAZON_BASE_URL,
+        'login_url': f'{AMAZON_BASE_URL}/ap/signin',
         'selectors': {
             'email_input': '#ap_email',
             'password_input': '#ap_password',
@@ -15,8 +18,25 @@ PLATFORMS = {
             'signin_button': '#signInSubmit',
             'add_to_cart': '#add-to-cart-button',
             'cart_icon': '#nav-cart',
-            'proceed_to_checkout': 'name="proceedToRetailCheckout"'
-        }
+            'proceed_to_checkout': 'name="proceedToRetailCheckout"',
+            # Plain CSS, so it also works on pages parsed by fetch_page
+            'cart_items': '[data-name="Active Items"] .sc-list-item, .cart-item, [data-testid="cart-item"]',
+            'cart_item_id': 'data-asin',  # Attribute of a cart item holding its product id
+            # Elements of the add_to_cart_url response that confirm the add
+            'add_confirmation': '#huc, #sw-atc-confirmation, #huc-v2-order-row-confirm-text',
+            'cart_count': '#nav-cart-count'
+        },
+        'cart_url': AMAZON_BASE_URL + '/gp/cart/view.html',
+        # Static/CDN origins pre-warmed with the storefront origin (none for a local stand-in)
+        'asset_hosts': [] if os.getenv('AMAZON_BASE_URL') else [
+            'https://m.media-amazon.com',
+            'https://images-eu.ssl-images-amazon.com',
+            'https://images-na.ssl-images-amazon.com'
+        ],
+        # Storefront cart endpoint; {product_id} is the ASIN
+        'add_to_cart_url': AMAZON_BASE_URL + '/gp/aws/cart/add.html?ASIN.1={product_id}&Quantity.1=1',
+        # Checkout entry behind the cart's "Proceed to checkout" button
+        'checkout_url': AMAZON_BASE_URL + '/gp/cart/desktop/go-to-checkout.html?proceedToRetailCheckout=1'
     },
     'flipkart': {
         'base_url': 'https://www.flipkart.com',
@@ -28,7 +48,16 @@ PLATFORMS = {
             'add_to_cart': 'button._2KpZ6l._2U9uOA._3v1-ww',
             'cart_icon': 'a[href="/viewcart"]',
             'place_order': 'button span:has-text("PLACE ORDER")'
-        }
+        },
+        'cart_url': 'https://www.flipkart.com/viewcart',
+        'asset_hosts': [
+            'https://rukminim1.flixcart.com',
+            'https://static-assets-web.flixcart.com',
+            'https://rome.api.flipkart.com'
+        ],
+        # No public add-to-cart URL endpoint, always uses the click flow
+        'add_to_cart_url': None,
+        'checkout_url': None
     }
 }
 
@@ -93,4 +122,193 @@ PERFORMANCE_FLAGS = {
     'disable_background_timer_throttling': True,
     'disable_backgrounding_occluded_windows': True,
     'disable_renderer_backgrounding': True
-}
\ No newline at end of file
+}
+
+# Lean render profile (FLOW_OPTIONS['lean_render']); benchmark with `python -m benchmarks.render`
+LEAN_RENDER = {
+    'viewport': {'width': 1280, 'height': 720},  # Still above the storefronts' desktop breakpoints
+    'reduced_motion': True,                      # prefers-reduced-motion: reduce
+    # Rendered only once scrolled into view (CSS content-visibility)
+    'offscreen_selectors': 'footer, #navFooter, #rhf, iframe',
+}
+
+# Local run history queried by `python history.py`
+RUN_HISTORY = {
+    'path': os.getenv('RUN_HISTORY_PATH', 'logs/run_history.sqlite3'),
+}
+
+# OpenMetrics endpoint (FLOW_OPTIONS['metrics_port'])
+METRICS = {
+    'host': os.getenv('METRICS_HOST', '127.0.0.1'),
+    # Upper bounds of the step duration histogram buckets, seconds
+    'duration_buckets': (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+}
+
+# OTLP JSON traces (FLOW_OPTIONS['trace_export']): posted to the collector when an endpoint is set, else written to directory
+TRACE_EXPORT = {
+    'directory': os.getenv('TRACE_DIRECTORY', 'logs/traces'),
+    'endpoint': os.getenv('OTEL_EXPORTER_OTLP_TRACES_ENDPOINT'),  # e.g. http://localhost:4318/v1/traces
+}
+
+# Sampling CPU profiler (FLOW_OPTIONS['cpu_profile'])
+CPU_PROFILE = {
+    'directory': 'logs/profiles',      # Collapsed stacks, one file per run
+    'interval': 0.005,                 # Seconds between samples
+    'top': 15,                         # Hotspots listed in the report
+}
+
+# Browser health watchdog (FLOW_OPTIONS['health_watchdog']); a crash is noticed within `interval`,
+# a hang within hung_after * (interval + probe_timeout)
+HEALTH_WATCHDOG = {
+    'interval': 2.0,                   # Seconds between health checks
+    'probe_timeout': 5.0,              # Seconds a page gets to evaluate a trivial script
+    'hung_after': 2,                   # Timed-out probes in a row that count as a hang
+    'step_restarts': 2,                # Times one step is started again on the recovered page
+}
+
+# Artificial delays of human-like input, (min, max) seconds drawn uniformly; FLOW_OPTIONS['direct_input'] skips them
+HUMAN_INPUT = {
+    'fast': {
+        'focus_pause': (0.05, 0.15),   # After clicking a field, before typing
+        'key_delay': (0.01, 0.03),     # Between keystrokes
+        'click_before': (0.2, 0.5),
+        'click_after': (0.2, 0.5),
+    },
+    'normal': {
+        'focus_pause': (0.1, 0.3),
+        'key_delay': (0.05, 0.15),
+        'click_before': (0.5, 1.5),
+        'click_after': (0.5, 2.0),
+    },
+}
+
+# Checkout flow options (override per run via ReliableEcommerceAutomation(options=...))
+FLOW_OPTIONS = {
+    'direct_add_to_cart': False,       # Add via the storefront cart URL before rendering the product page
+    'persistent_profile': True,        # Launch from the on-disk user_data/ profile
+    'headless': False,                 # Keep visible for debugging
+    'interactive': True,               # Wait for Enter before closing the browser (TTY only)
+    'resource_sample_interval': 0,     # Seconds between browser RSS/CPU samples, 0 disables sampling
+    'deadline_seconds': None,          # End-to-end deadline split into per-step budgets (None disables)
+    'race_login_entry_points': False,  # Load all login entry points in parallel tabs, keep the first usable one
+    'skip_cart_page': False,           # Go straight to the checkout entry when the cart is known to hold the item
+    'optimistic_checkout': False,      # Start checkout as soon as the add-to-cart click lands, verify the cart over HTTP meanwhile
+    'session_state': False,            # Start a fresh context from the encrypted saved session instead of user_data/
+    'loop_stall_threshold': None,      # Debug: report callbacks blocking the event loop longer than this (seconds)
+    'network_instrumentation': False,  # Record every request's timing, size, type and domain per phase
+    'navigation_timing': True,         # Attach Navigation Timing/paint metrics of every navigation to its step
+    'prewarm_connections': True,       # Preconnect to the storefront and asset origins during startup
+    'record_history': False,           # Append each run's spans and outcome to the RUN_HISTORY database
+    'metrics_port': None,              # Serve OpenMetrics on 127.0.0.1:<port>/metrics for the whole process (None disables)
+    'trace_export': False,             # Export phases and browser operations as an OTLP JSON trace (see TRACE_EXPORT)
+    'cpu_profile': False,              # Sample the event loop's Python stacks for the whole run (see CPU_PROFILE)
+    'renderer_metrics': False,         # Sample Chromium script/layout/style/task time and JS heap over CDP at every phase boundary
+    'lean_render': False,              # Small viewport, reduced motion, no CSS animations, skipped off-screen blocks (see LEAN_RENDER)
+    'health_watchdog': False,          # Check driver, browser and page health and recover automatically (see HEALTH_WATCHDOG)
+    'direct_input': False,             # Atomic fills and actionability-checked clicks instead of human-like typing and pauses
+}
+
+# Named FLOW_OPTIONS overrides, selected with `python cli.py --profile <name>`
+FLOW_PROFILES = {
+    'default': {},
+    'headless': {'headless': True},
+    'ci': {
+        'headless': True,
+        'persistent_profile': False,
+        'session_state': True,
+        'deadline_seconds': 90,
+        'lean_render': True,
+        'direct_input': True,
+        'direct_add_to_cart': True,
+        'skip_cart_page': True,
+        'optimistic_checkout': True,
+        'record_history': True,
+    },
+    'debug': {'loop_stall_threshold': 0.1, 'network_instrumentation': True, 'renderer_metrics': True,
+              'resource_sample_interval': 0.25},
+}
+
+# Exported storage state (cookies + localStorage), Fernet-encrypted with SESSION_STATE_KEY
+SESSION_STATE = {
+    'path': os.getenv('SESSION_STATE_PATH', 'session/storage_state.enc'),
+    'key': os.getenv('SESSION_STATE_KEY')
+}
+
+# Relative share of the remaining deadline each flow step may use
+DEADLINE_STEP_WEIGHTS = {
+    'browser_start': 1.5,
+    'session_check': 0.5,
+    'login': 3.0,
+    'direct_add_to_cart': 0.5,
+    'product_page': 1.5,
+    'add_to_cart': 2.0,
+    'cart_page': 1.5,
+    'checkout': 3.0
+}
+
+# Retry policies per flow step; attempts include the first try
+RETRY_POLICIES = {
+    'default': {'max_attempts': 2, 'base_delay': 0.2, 'max_delay': 1.0},
+    'login': {'max_attempts': 3, 'base_delay': 0.3, 'max_delay': 1.0},   # One attempt per login entry point
+    'direct_add_to_cart': {'max_attempts': 1},                           # The click flow is the fallback
+    'click': {'max_attempts': 2, 'base_delay': 0.05, 'max_delay': 0.2},
+    'product_page': {'max_attempts': 2, 'base_delay': 0.3, 'max_delay': 1.0},
+    'add_to_cart': {'max_attempts': 2, 'base_delay': 0.3, 'max_delay': 1.0},  # Only retried when no button took the click
+    'cart_page': {'max_attempts': 2, 'base_delay': 0.2, 'max_delay': 1.0},    # One attempt per cart URL
+    'checkout': {'max_attempts': 2, 'base_delay': 0.3, 'max_delay': 1.0},     # A retry signs in again first
+}
+
+# Circuit breaker per endpoint (origin + path), shared by all runs of one automation instance
+CIRCUIT_BREAKER = {
+    'failure_threshold': 3,            # Consecutive failures before the circuit opens
+    'reset_timeout': 30.0              # Seconds before a single trial call is let through
+}
+
+# Performance regression gate (benchmarks/regression_gate.py)
+REGRESSION_GATE = {
+    'baseline_file': 'benchmarks/baseline.json',
+    'runs': 10,                        # Checkout runs per sample
+    'alpha': 0.05,                     # Significance level of the one-sided Mann-Whitney U test
+    'tolerance': 0.15,                 # Allowed relative slowdown of a phase median
+    'min_delta': 0.05,                 # Ignore median shifts below 50ms
+    'confidence': 0.95,                # Bootstrap confidence interval level
+    'bootstrap_samples': 2000,
+    'min_samples': 5,                  # Phases with fewer samples on either side are reported, not gated
+    'flow_options': {
+        'persistent_profile': False,
+        'headless': True,
+        'interactive': False,
+        'record_history': False,
+    }
+}
+
+# Browser-free checkout simulator (benchmarks/simulator.py)
+SIMULATOR = {
+    'runs': 1000,
+    'seed': 0,
+    # Log-normal latencies as (median seconds, sigma)
+    'latency': {
+        'startup_persistent': (1.6, 0.2),
+        'startup_fresh': (0.9, 0.2),
+        'navigation': (0.8, 0.5),
+        'request': (0.25, 0.4),
+        'query': (0.004, 0.5),         # locator().count(), content(), text_content()
+        'selector': (0.03, 0.6),       # wait_for_selector on an element that is there
+        'click': (0.05, 0.3),
+        'fill': (0.02, 0.3),
+    },
+    # Chance per run (or per request) of each page state
+    'probabilities': {
+        'session_expired': 0.1,        # Session cookies no longer valid
+        'direct_add_fails': 0.05,      # Cart URL answers with an error
+        'checkout_bounce': 0.05,       # Checkout entry sends a full cart back to the cart page
+        'entry_point_down': 0.02,      # A login entry point never finishes loading
+    },
+    'flow_options': {
+        'persistent_profile': False,
+        'headless': True,
+        'interactive': False,
+        'resource_sample_interval': 0,
+        'record_history': False,
+    }
+}
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Trends over the recorded run history (see RUN_HISTORY in config/settings.py).
+
+    python history.py                       # last 30 days, per day
+    python history.py --days 90 --bucket week --profile ci
+    python history.py --phase checkout
+
+Shows per-phase p50/p95 per period, the failure rate of each step and the
+slowest recent runs, to catch drift such as a selector that started
+falling through to slower fallbacks.
+"""
+import argparse
+import sys
+import time
+
+from config.settings import RUN_HISTORY
+from src.run_history import BUCKET_FORMATS, RunHistory
+
+
+def print_trends(trends, phase=None):
+    rows = [row for row in trends if phase is None or row['phase'] == phase]
+    print("\n" + "="*72)
+    print("📈 PHASE TRENDS (successful spans, seconds)")
+    print("="*72)
+    if not rows:
+        print("No runs recorded in this window")
+        return
+    print(f"{'Period':<12}{'Phase':<24}{'runs':>8}{'p50':>10}{'p95':>10}")
+    for row in rows:
+        print(f"{row['period']:<12}{row['phase']:<24}{row['count']:>8}{row['p50']:>10.3f}{row['p95']:>10.3f}")
+
+
+def print_failure_rates(rates):
+    print("\n" + "="*72)
+    print("❌ FAILURE RATE PER STEP")
+    print("="*72)
+    print(f"{'Step':<24}{'ran':>8}{'failed':>8}{'rate':>10}{'ended run':>12}")
+    for row in rates:
+        print(f"{row['step']:<24}{row['runs']:>8}{row['failures']:>8}{row['rate']:>10.1%}{row['ended_runs']:>12}")
+
+
+def print_slowest(runs):
+    print("\n" + "="*72)
+    print("🐌 SLOWEST RECENT RUNS")
+    print("="*72)
+    for run in runs:
+        started = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['started_at']))
+        outcome = run['status'] if not run['failed_step'] else f"{run['status']} at {run['failed_step']}"
+        slowest = f"{run['slowest_phase']} {run['slowest_phase_seconds']:.2f}s" if run['slowest_phase'] else '-'
+        print(f"  #{run['id']:<6}{started}  {run['total_seconds']:>7.2f}s  {outcome:<24} slowest: {slowest}")
+        print(f"          {run['product_url']} ({run['profile']})")
+    print("="*72)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show trends from the recorded run history")
+    parser.add_argument('--db', default=RUN_HISTORY['path'], help="History database file")
+    parser.add_argument('--days', type=float, default=30, help="Only runs from the last N days")
+    parser.add_argument('--bucket', default='day', choices=sorted(BUCKET_FORMATS))
+    parser.add_argument('--platform', help="Only runs on this platform")
+    parser.add_argument('--profile', help="Only runs with this options profile")
+    parser.add_argument('--phase', help="Only show trends of this phase")
+    parser.add_argument('--limit', type=int, default=10, help="Number of slowest runs to list")
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.db)
+    since = time.time() - args.days * 86400
+    filters = {'since': since, 'platform_name': args.platform, 'profile': args.profile}
+    print_trends(history.phase_trends(bucket=args.bucket, **filters), args.phase)
+    print_failure_rates(history.failure_rates(**filters))
+    print_slowest(history.slowest_runs(limit=args.limit, **filters))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,8 @@
 # performance_monitor.py - Performance monitoring for ultra-fast automation
 import time
 import asyncio
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 @dataclass
 class PerformanceMetric:
@@ -12,23 +12,46 @@ class PerformanceMetric:
     duration: float
     success: bool
     error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class ResourceUsage:
+    samples: int = 0
+    rss_sum: int = 0
+    peak_rss: int = 0
+    peak_renderer_rss: int = 0
+    cpu_seconds: float = 0.0
+    
+    @property
+    def avg_rss(self) -> float:
+        return self.rss_sum / self.samples if self.samples else 0.0
+
+IDLE_PHASE = 'between_phases'
+MB = 1024 * 1024
 
 class PerformanceMonitor:
-    def __init__(self):
+    def __init__(self, clock=time.time):
+        self.clock = clock
         self.metrics: List[PerformanceMetric] = []
+        self.resource_usage: Dict[str, ResourceUsage] = {}
+        self.counters: Dict[str, int] = {}
         self.start_time = None
         self.current_operation = None
+        self.current_attributes: Dict[str, Any] = {}
+        # Optional src.openmetrics.MetricsRegistry that also receives every span and counter
+        self.registry = None
     
     def start_operation(self, operation: str):
         """Start timing an operation"""
         self.current_operation = operation
-        self.start_time = time.time()
+        self.current_attributes = {}
+        self.start_time = self.clock()
         print(f"⏱️ Starting: {operation}")
     
     def end_operation(self, success: bool = True, error: str = None):
         """End timing an operation"""
-        if self.current_operation and self.start_time:
-            end_time = time.time()
+        if self.current_operation and self.start_time is not None:
+            end_time = self.clock()
             duration = end_time - self.start_time
             
             metric = PerformanceMetric(
@@ -37,17 +60,34 @@ class PerformanceMonitor:
                 end_time=end_time,
                 duration=duration,
                 success=success,
-                error=error
+                error=error,
+                attributes=self.current_attributes
             )
             
             self.metrics.append(metric)
+            if self.registry:
+                self.registry.observe_step(self.current_operation, duration, success)
             
             status = "✅" if success else "❌"
             print(f"{status} {self.current_operation}: {duration:.2f}s")
             
             self.current_operation = None
+            self.current_attributes = {}
             self.start_time = None
     
+    def count(self, name: str, amount: int = 1):
+        """Increment a run counter, and the same attribute on the running operation"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+        if self.registry:
+            self.registry.count_event(name, self.current_operation or IDLE_PHASE, amount)
+        if self.current_operation:
+            self.current_attributes[name] = self.current_attributes.get(name, 0) + amount
+    
+    def set_attribute(self, key: str, value: Any):
+        """Attach a detail to the running operation"""
+        if self.current_operation:
+            self.current_attributes[key] = value
+    
     def get_total_time(self) -> float:
         """Get total execution time"""
         if not self.metrics:
@@ -64,6 +104,32 @@ class PerformanceMonitor:
                 return metric.duration
         return 0.0
     
+    def get_phase_durations(self) -> Dict[str, float]:
+        """Get total time per operation, summing repeated operations"""
+        durations: Dict[str, float] = {}
+        for metric in self.metrics:
+            durations[metric.operation] = durations.get(metric.operation, 0.0) + metric.duration
+        return durations
+    
+    def record_resource_sample(self, rss: int, renderer_rss: int, cpu_seconds: float):
+        """Attribute one browser memory/CPU sample to the running operation"""
+        phase = self.current_operation or IDLE_PHASE
+        usage = self.resource_usage.setdefault(phase, ResourceUsage())
+        usage.samples += 1
+        usage.rss_sum += rss
+        usage.peak_rss = max(usage.peak_rss, rss)
+        usage.peak_renderer_rss = max(usage.peak_renderer_rss, renderer_rss)
+        usage.cpu_seconds += cpu_seconds
+    
+    def reset(self):
+        """Drop all recorded metrics"""
+        self.metrics = []
+        self.resource_usage = {}
+        self.counters = {}
+        self.start_time = None
+        self.current_operation = None
+        self.current_attributes = {}
+    
     def get_slowest_operations(self, limit: int = 5) -> List[PerformanceMetric]:
         """Get the slowest operations"""
         sorted_metrics = sorted(self.metrics, key=lambda x: x.duration, reverse=True)
@@ -112,6 +178,26 @@ class PerformanceMonitor:
             for metric in failed_ops:
                 print(f"  - {metric.operation}: {metric.error}")
         
+        detailed = [m for m in self.metrics if m.attributes]
+        if detailed:
+            print(f"\n📝 Operation Details:")
+            for metric in detailed:
+                # Structured values (e.g. per-navigation timings) are left to export_metrics
+                details = ", ".join(f"{key}={value}" for key, value in metric.attributes.items()
+                                    if not isinstance(value, (list, dict)))
+                print(f"  - {metric.operation}: {details}")
+        
+        if self.counters:
+            print(f"\n🔢 Counters:")
+            for name, value in sorted(self.counters.items()):
+                print(f"  - {name}: {value}")
+        
+        if self.resource_usage:
+            print(f"\n🧠 Browser Resources (RSS summed over browser processes):")
+            for phase, usage in self.resource_usage.items():
+                print(f"  - {phase}: peak {usage.peak_rss / MB:.1f} MB, avg {usage.avg_rss / MB:.1f} MB, "
+                      f"renderer peak {usage.peak_renderer_rss / MB:.1f} MB, CPU {usage.cpu_seconds:.2f}s")
+        
         print("="*50)
     
     def export_metrics(self, filename: str = "performance_metrics.txt"):
@@ -125,8 +211,23 @@ class PerformanceMonitor:
                 f.write(f"{metric.operation}: {metric.duration:.2f}s [{status}]\n")
                 if metric.error:
                     f.write(f"  Error: {metric.error}\n")
+                for key, value in metric.attributes.items():
+                    f.write(f"  {key}: {value}\n")
+                f.write("\n")
+            
+            if self.counters:
+                f.write("Counters\n")
+                for name, value in sorted(self.counters.items()):
+                    f.write(f"{name}: {value}\n")
                 f.write("\n")
             
+            if self.resource_usage:
+                f.write("Browser Resources\n")
+                for phase, usage in self.resource_usage.items():
+                    f.write(f"{phase}: peak_rss={usage.peak_rss / MB:.1f}MB avg_rss={usage.avg_rss / MB:.1f}MB "
+                            f"renderer_peak_rss={usage.peak_renderer_rss / MB:.1f}MB cpu={usage.cpu_seconds:.2f}s "
+                            f"samples={usage.samples}\n")
+            
             f.write(f"\nTotal Time: {self.get_total_time():.2f}s\n")
             f.write(f"Target: <25s\n")
             f.write(f"Performance: {'✅ MET' if self.get_total_time() <= 25 else '❌ MISSED'}\n")
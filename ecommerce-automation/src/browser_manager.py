@@ -1,8 +1,125 @@
 from playwright.async_api import async_playwright
 import asyncio
 import random
+import sys
 import time
 import pathlib
+import importlib.util
+from urllib.parse import urlparse
+import json
+from dataclasses import dataclass
+from typing import List
+from bs4 import BeautifulSoup
+from src.deadline import BudgetExceeded
+from src.retry_policy import Retrier
+from src.time_attribution import LedgerEntry, LAUNCH, NAVIGATION, SLEEP, FAILED_PROBE, INTERACTION
+from src.direct_input import FIELD, CLICK, human_delay, expected_typing_delay, expected_click_delay
+from config.settings import RETRY_POLICIES, CIRCUIT_BREAKER, LEAN_RENDER, PERFORMANCE_FLAGS
+
+STEALTH_SCRIPT = """
+    // Remove webdriver property
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined,
+    });
+    // Mock plugins
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5],
+    });
+    // Mock languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en'],
+    });
+    // Mock permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+    // Mock chrome runtime
+    if (typeof chrome !== 'undefined') {
+        Object.defineProperty(chrome, 'runtime', {
+            get: () => ({
+                onConnect: undefined,
+                onMessage: undefined,
+                connect: undefined,
+                sendMessage: undefined
+            })
+        });
+    }
+    // Override permissions
+    const originalGetUserMedia = navigator.mediaDevices.getUserMedia;
+    navigator.mediaDevices.getUserMedia = function(constraints) {
+        return Promise.reject(new Error('Not allowed'));
+    };
+"""
+
+# Injected stylesheet of the lean render profile: animations and transitions finish at once
+# (their end events still fire) and heavy off-screen blocks are skipped until scrolled to
+LEAN_RENDER_CSS = (
+    ("*, *::before, *::after { animation-duration: 0s !important; animation-delay: 0s !important; "
+     "animation-iteration-count: 1 !important; transition-duration: 0s !important; "
+     "transition-delay: 0s !important; scroll-behavior: auto !important; } "
+     if PERFORMANCE_FLAGS['disable_animations'] else '')
+    + f"{LEAN_RENDER['offscreen_selectors']} {{ content-visibility: auto; contain-intrinsic-size: auto 500px; }}"
+)
+LEAN_RENDER_SCRIPT = """
+(() => {
+    const add = () => {
+        const style = document.createElement('style');
+        style.textContent = %s;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) add();
+    else document.addEventListener('readystatechange', add, { once: true });
+})();
+""" % json.dumps(LEAN_RENDER_CSS)
+
+# Navigation Timing and paint entries of the current document, in ms
+NAVIGATION_TIMING_SCRIPT = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    const paints = {};
+    for (const entry of performance.getEntriesByType('paint')) paints[entry.name] = entry.startTime;
+    const since = (end, start) => (end > 0 && start >= 0 ? end - start : null);
+    return {
+        dns_ms: since(nav.domainLookupEnd, nav.domainLookupStart),
+        connect_ms: since(nav.connectEnd, nav.connectStart),
+        ttfb_ms: since(nav.responseStart, nav.requestStart),
+        download_ms: since(nav.responseEnd, nav.responseStart),
+        dom_content_loaded_ms: since(nav.domContentLoadedEventEnd, 0),
+        load_ms: since(nav.loadEventEnd, 0),
+        first_contentful_paint_ms: paints['first-contentful-paint'] ?? null,
+        server_ms: since(nav.responseEnd, 0),
+        render_ms: since(nav.domContentLoadedEventEnd, nav.responseEnd),
+        transfer_bytes: nav.transferSize,
+    };
+}
+"""
+
+# lxml parses several times faster than the stdlib parser; use it when installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+@dataclass
+class FetchedPage:
+    """A page fetched over HTTP and parsed in Python, for read-only checks"""
+    url: str
+    status: int
+    soup: BeautifulSoup
+
+    def select(self, selector: str) -> List[str]:
+        """Stripped text of every element matching a CSS selector"""
+        return [element.get_text(strip=True) for element in self.soup.select(selector)]
+
+    def count(self, selector: str) -> int:
+        return len(self.soup.select(selector))
+
+    def attribute(self, selector: str, name: str) -> List[str]:
+        """Values of attribute `name` on every element matching a CSS selector that has it"""
+        return [element[name] for element in self.soup.select(selector) if element.has_attr(name)]
+
 
 class AdvancedBrowserManager:
     def __init__(self):
@@ -10,6 +127,24 @@ class AdvancedBrowserManager:
         self.page = None
         self.playwright = None
         self.context = None
+        self.deadline = None
+        self.retrier = Retrier(RETRY_POLICIES, CIRCUIT_BREAKER)
+        self.time_ledger = None
+        self.prewarm_task = None
+        self.monitor = None
+        self.collect_navigation_timing = True
+        # src.renderer_metrics.RendererMetrics when renderer sampling is on
+        self.renderer_metrics = None
+        self.lean_render = False
+        # Profile directory for persistent launches
+        self.user_data_dir = 'user_data'
+        # src.direct_input.DirectInputSavings in direct input mode: no human-like delays, savings recorded there
+        self.direct_input = None
+        # What start_browser was called with and where the working page was, for recovery
+        self.launch_options = {}
+        self.context_options = {}
+        self.last_url = None
+        self.watchdog = None
     
     async def start_browser_ultra_fast(self):
         """Start browser with ultra-optimized settings for maximum speed"""
@@ -155,8 +290,22 @@ class AdvancedBrowserManager:
         
         return self.page
     
-    async def start_browser(self, persistent: bool = True):
-        """Start browser with enhanced anti-detection measures. Persistent context by default."""
+    async def start_browser(self, persistent: bool = True, headless: bool = False, storage_state: dict = None,
+                            warm_origins=None, lean_render: bool = False):
+        """Start browser with enhanced anti-detection measures. Persistent context by default.
+
+        Non-persistent contexts start from `storage_state` when given, which is
+        much faster than loading the on-disk profile. Connections to
+        `warm_origins` are opened in the background as soon as the context exists.
+        `lean_render` applies the LEAN_RENDER profile to the context and every page.
+        """
+        self.lean_render = lean_render
+        self.launch_options = {'persistent': persistent, 'headless': headless, 'storage_state': storage_state,
+                               'warm_origins': warm_origins}
+        with self.track(LAUNCH, 'persistent' if persistent else 'fresh'):
+            return await self._start_browser(persistent, headless, storage_state, warm_origins)
+    
+    async def _start_browser(self, persistent, headless, storage_state, warm_origins=None):
         self.playwright = await async_playwright().start()
         user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -192,97 +341,125 @@ class AdvancedBrowserManager:
             '--ignore-certificate-errors-spki-list',
             '--start-maximized'
         ]
+        render_options = self._render_options()
+        if self.lean_render:
+            # A window the size of the viewport instead of a maximized one
+            viewport = LEAN_RENDER['viewport']
+            browser_args = [arg for arg in browser_args if arg != '--start-maximized'] + [
+                f"--window-size={viewport['width']},{viewport['height']}",
+                '--disable-smooth-scrolling',
+            ]
+        # Kept for contexts opened later by recycle_context()
+        self.context_options = {
+            **render_options,
+            'user_agent': random.choice(user_agents),
+            'locale': 'en-US',
+            'timezone_id': 'Asia/Kolkata',
+            'permissions': ['geolocation'],
+            'extra_http_headers': {
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'DNT': '1',
+                'Connection': 'keep-alive',
+                'Upgrade-Insecure-Requests': '1'
+            }
+        }
         if persistent:
-            user_data_dir = str(pathlib.Path('user_data').absolute())
+            user_data_dir = str(pathlib.Path(self.user_data_dir).absolute())
             self.browser = await self.playwright.chromium.launch_persistent_context(
                 user_data_dir,
-                headless=False,  # VISIBLE for reliability
+                headless=headless,  # VISIBLE by default for reliability
                 args=browser_args,
-                viewport={'width': 1920, 'height': 1080},
-                user_agent=random.choice(user_agents),
-                locale='en-US',
-                timezone_id='Asia/Kolkata',
-                permissions=['geolocation'],
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1'
-                }
+                timeout=self.clamp_timeout(30000),
+                **self.context_options
             )
             self.page = self.browser.pages[0] if self.browser.pages else await self.browser.new_page()
-            await self._block_resources(self.page)
         else:
             self.browser = await self.playwright.chromium.launch(
-                headless=False,  # VISIBLE for reliability
+                headless=headless,  # VISIBLE by default for reliability
                 args=browser_args,
-                timeout=60000
-            )
-            self.context = await self.browser.new_context(
-                user_agent=random.choice(user_agents),
-                viewport={'width': 1920, 'height': 1080},
-                locale='en-US',
-                timezone_id='Asia/Kolkata',
-                permissions=['geolocation'],
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1'
-                }
+                timeout=self.clamp_timeout(60000)
             )
+            self.context = await self.browser.new_context(storage_state=storage_state, **self.context_options)
             self.page = await self.context.new_page()
-            await self._block_resources(self.page)
-        # Enhanced anti-detection scripts
-        await self.page.add_init_script("""
-            // Remove webdriver property
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined,
-            });
-            // Mock plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5],
-            });
-            // Mock languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en'],
-            });
-            // Mock permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-            // Mock chrome runtime
-            if (typeof chrome !== 'undefined') {
-                Object.defineProperty(chrome, 'runtime', {
-                    get: () => ({
-                        onConnect: undefined,
-                        onMessage: undefined,
-                        connect: undefined,
-                        sendMessage: undefined
-                    })
-                });
-            }
-            // Override permissions
-            const originalGetUserMedia = navigator.mediaDevices.getUserMedia;
-            navigator.mediaDevices.getUserMedia = function(constraints) {
-                return Promise.reject(new Error('Not allowed'));
-            };
-        """)
-        self.page.set_default_timeout(3000)
-        self.page.set_default_navigation_timeout(3000)
+        self._start_prewarm(self.page.context, warm_origins)
+        await self._prepare_page(self.page)
         return self.page
+
+    def _start_prewarm(self, context, warm_origins):
+        """Warm connections to `warm_origins` in the background, replacing any warm-up still running"""
+        if not warm_origins:
+            return
+        if self.prewarm_task and not self.prewarm_task.done():
+            self.prewarm_task.cancel()
+        self.prewarm_task = asyncio.create_task(self.prewarm_connections(context, warm_origins))
+    
+    async def prewarm_connections(self, context, origins, settle=1.0):
+        """Open connections to `origins` from a throwaway tab, so the first real navigations skip DNS/TCP/TLS.
+
+        Chromium pools sockets per browser context, so preconnects made by
+        one tab are reused by the working page. Each origin is preconnected
+        both without and with CORS, since navigations and most CDN
+        assets use different sockets. The context's request API runs outside
+        Chromium and does not benefit.
+        """
+        links = ''.join(
+            f'<link rel="preconnect" href="{origin}"><link rel="preconnect" href="{origin}" crossorigin>'
+            for origin in origins
+        )
+        page = None
+        try:
+            page = await context.new_page()
+            await page.set_content(f"<html><head>{links}</head></html>")
+            # Give the handshakes time to finish before the tab goes away
+            await asyncio.sleep(settle)
+            print(f"🔥 Pre-warmed connections to {len(origins)} origin(s)")
+        except Exception as e:
+            print(f"⚠️ Connection pre-warming failed: {e}")
+        finally:
+            if page:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+    
+    def _render_options(self):
+        """Viewport and rendering options shared by both context types"""
+        if not self.lean_render:
+            return {'viewport': {'width': 1920, 'height': 1080}}
+        return {
+            'viewport': LEAN_RENDER['viewport'],
+            'device_scale_factor': 1,
+            'reduced_motion': 'reduce' if LEAN_RENDER['reduced_motion'] else 'no-preference',
+        }
+    
+    async def export_storage_state(self):
+        """Cookies and localStorage of the working context, as accepted by new_context(storage_state=...)"""
+        return await self.page.context.storage_state()
+    
+    async def _prepare_page(self, page):
+        """Apply resource blocking, anti-detection scripts and default timeouts to a page"""
+        await self._block_resources(page)
+        # Enhanced anti-detection scripts
+        await page.add_init_script(STEALTH_SCRIPT)
+        if self.lean_render:
+            await page.add_init_script(LEAN_RENDER_SCRIPT)
+        page.set_default_timeout(3000)
+        page.set_default_navigation_timeout(3000)
+    
+    async def new_page(self):
+        """Open another prepared tab in the working page's context"""
+        page = await self.page.context.new_page()
+        await self._prepare_page(page)
+        return page
     
     async def _block_resources(self, page):
         """Block images for speed, but allow fonts/media for reliability."""
         async def route_handler(route):
             if route.request.resource_type == "image":
+                if self.monitor:
+                    self.monitor.count('blocked_requests')
                 await route.abort()
             else:
                 await route.continue_()
@@ -316,41 +493,106 @@ class AdvancedBrowserManager:
             except:
                 print(f"❌ Failed to click: {selector}")
     
+    def clamp_timeout(self, timeout_ms):
+        """Clamp a Playwright timeout to the current step budget (no-op without a deadline)"""
+        return self.deadline.clamp_ms(timeout_ms) if self.deadline else timeout_ms
+    
+    async def renderer_snapshot(self, timeout_ms=500):
+        """Renderer metrics of the working page over CDP, None when sampling is off, unsupported or too slow.
+
+        Bounded by `timeout_ms` and the step budget, so a stuck renderer cannot hold a step past its deadline.
+        """
+        if self.renderer_metrics is None:
+            return None
+        try:
+            timeout = self.clamp_timeout(timeout_ms) / 1000
+            return await asyncio.wait_for(self.renderer_metrics.snapshot(self.page), timeout=timeout)
+        except (asyncio.TimeoutError, BudgetExceeded):
+            return None
+    
+    def track(self, category, detail=None, **attributes):
+        """Attribute the time of a `with` block to a category of the time ledger (no-op without one)"""
+        return LedgerEntry(self.time_ledger, category, detail, attributes)
+    
+    async def pause(self, seconds):
+        """Sleep, never past the current step budget"""
+        if self.deadline:
+            seconds = self.deadline.clamp_seconds(seconds)
+        # Name the caller, so the ledger can say which pauses add up
+        with self.track(SLEEP, f"pause in {sys._getframe(1).f_code.co_name}"):
+            await asyncio.sleep(seconds)
+    
     async def human_like_typing(self, selector, text, fast_mode=False):
-        """Type text with human-like delays (faster in fast mode)"""
+        """Type text with human-like delays (faster in fast mode); fills it at once in direct input mode"""
+        if self.direct_input:
+            return await self.direct_fill(selector, text, fast_mode)
+        with self.track(INTERACTION, f"type {selector}", selector=selector):
+            await self._human_like_typing(selector, text, fast_mode)
+    
+    async def direct_fill(self, selector, text, fast_mode=False):
+        """Set the field's value in one step once it is visible, enabled and editable"""
+        started = self.direct_input.clock()
+        with self.track(INTERACTION, f"fill {selector}", selector=selector):
+            await self.page.fill(selector, text, timeout=self.clamp_timeout(5000))
+        # fast_mode only says which human-like delays were skipped
+        self.direct_input.record(FIELD, selector, self.direct_input.clock() - started,
+                                 expected_typing_delay(text, fast_mode))
+    
+    async def _human_like_typing(self, selector, text, fast_mode):
         try:
-            await self.page.click(selector, timeout=5000)
-            await asyncio.sleep(random.uniform(0.05, 0.15) if fast_mode else random.uniform(0.1, 0.3))
+            await self.page.click(selector, timeout=self.clamp_timeout(5000))
+            await self.pause(random.uniform(*human_delay('focus_pause', fast_mode)))
             
             # Clear field first
-            await self.page.fill(selector, '')
+            await self.page.fill(selector, '', timeout=self.clamp_timeout(5000))
             
             if fast_mode:
                 # Fast typing for better performance
-                await self.page.type(selector, text, delay=random.uniform(10, 30))
+                key_delay = random.uniform(*human_delay('key_delay', fast_mode)) * 1000
+                await self.page.type(selector, text, delay=key_delay, timeout=self.clamp_timeout(5000))
             else:
                 # Human-like typing
                 for char in text:
                     await self.page.keyboard.type(char)
-                    await asyncio.sleep(random.uniform(0.05, 0.15))
+                    await self.pause(random.uniform(*human_delay('key_delay', fast_mode)))
+        except BudgetExceeded:
+            raise
         except Exception as e:
             print(f"⚠️ Typing error: {e}")
             # Fallback to simple fill
-            await self.page.fill(selector, text)
+            await self.page.fill(selector, text, timeout=self.clamp_timeout(5000))
     
     async def human_like_click(self, selector, fast_mode=False):
-        """Click with human-like delay (faster in fast mode)"""
+        """Click with human-like delay (faster in fast mode).
+
+        In direct input mode the click goes out as soon as Playwright's
+        actionability checks pass (visible, stable, enabled, receiving events).
+        Returns False when every attempt of the `click` retry policy failed.
+        """
+        direct = self.direct_input
+        async def attempt(number):
+            entry.attributes['retry_count'] = number - 1
+            if number == 1:
+                if not direct:
+                    await self.pause(random.uniform(*human_delay('click_before', fast_mode)))
+                await self.page.click(selector, timeout=self.clamp_timeout(5000))
+                if not direct:
+                    await self.pause(random.uniform(*human_delay('click_after', fast_mode)))
+            else:
+                # Try alternative click method
+                await self.page.locator(selector).click(timeout=self.clamp_timeout(5000))
         try:
-            await asyncio.sleep(random.uniform(0.2, 0.5) if fast_mode else random.uniform(0.5, 1.5))
-            await self.page.click(selector, timeout=5000)
-            await asyncio.sleep(random.uniform(0.2, 0.5) if fast_mode else random.uniform(0.5, 2.0))
+            started = direct.clock() if direct else None
+            with self.track(INTERACTION, f"click {selector}", selector=selector) as entry:
+                await self.retrier.run('click', attempt)
+            if direct:
+                direct.record(CLICK, selector, direct.clock() - started, expected_click_delay(fast_mode))
+            return True
+        except BudgetExceeded:
+            raise
         except Exception as e:
-            print(f"⚠️ Click error: {e}")
-            # Try alternative click method
-            try:
-                await self.page.locator(selector).click(timeout=5000)
-            except:
-                print(f"❌ Failed to click: {selector}")
+            print(f"❌ Failed to click: {selector} ({e})")
+            return False
     
     async def random_mouse_movement(self):
         """Add random mouse movements"""
@@ -359,41 +601,199 @@ class AdvancedBrowserManager:
                 x = random.randint(100, 800)
                 y = random.randint(100, 600)
                 await self.page.mouse.move(x, y)
-                await asyncio.sleep(random.uniform(0.05, 0.2))
-        except:
+                await self.pause(random.uniform(0.05, 0.2))
+        except Exception:
             pass  # Ignore mouse movement errors
     
     async def wait_for_element(self, selector, timeout=10000):
         """Wait for element with timeout"""
-        try:
-            await self.page.wait_for_selector(selector, timeout=timeout)
-            return True
-        except:
-            return False
+        timeout = self.clamp_timeout(timeout)
+        with self.track(INTERACTION, f"wait {selector}", selector=selector) as entry:
+            try:
+                await self.page.wait_for_selector(selector, timeout=timeout)
+                return True
+            except Exception:
+                entry.category = FAILED_PROBE
+                return False
     
     async def element_exists(self, selector):
         """Check if element exists"""
-        try:
-            return await self.page.locator(selector).count() > 0
-        except:
-            return False
+        with self.track(INTERACTION, f"check {selector}", selector=selector) as entry:
+            try:
+                found = await self.page.locator(selector).count() > 0
+            except Exception:
+                found = False
+            if not found:
+                entry.category = FAILED_PROBE
+            return found
     
-    async def safe_navigate(self, url, timeout=12000):
-        """Navigate to URL with error handling"""
+    async def safe_navigate(self, url, timeout=12000, page=None):
+        """Navigate to URL with error handling (the working page unless another tab is given)"""
+        page = page or self.page
+        if page is self.page:
+            self.last_url = url
+        with self.track(NAVIGATION, f"goto {urlparse(url).path or '/'}", url=url):
+            navigated = await self._navigate(page, url, timeout)
+        if navigated and self.monitor and self.collect_navigation_timing:
+            await self.record_navigation_timing(page, url)
+        return navigated
+
+    async def record_navigation_timing(self, page, url):
+        """Attach the page's Navigation Timing and paint metrics to the running span.
+
+        Navigations only wait for DOMContentLoaded, so load and first
+        contentful paint are None when they had not happened yet.
+        """
         try:
-            await self.page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+            timing = await page.evaluate(NAVIGATION_TIMING_SCRIPT)
+        except Exception:
+            return
+        if not timing:
+            return
+        timing['path'] = urlparse(url).path or '/'
+        attributes = self.monitor.current_attributes
+        self.monitor.set_attribute('navigation_timing', attributes.get('navigation_timing', []) + [timing])
+        # Running totals split the step's navigations into server time and client-side render time
+        for key in ('server_ms', 'render_ms'):
+            if timing[key] is not None:
+                self.monitor.set_attribute(f"nav_{key}", round(attributes.get(f"nav_{key}", 0) + timing[key], 1))
+
+    async def _navigate(self, page, url, timeout):
+        try:
+            await page.goto(url, wait_until='domcontentloaded', timeout=self.clamp_timeout(timeout))
             return True
+        except BudgetExceeded:
+            raise
         except Exception as e:
             print(f"⚠️ Navigation error: {e}")
             try:
                 # Fallback to networkidle
-                await self.page.goto(url, wait_until='networkidle', timeout=timeout)
+                await page.goto(url, wait_until='networkidle', timeout=self.clamp_timeout(timeout))
                 return True
-            except:
+            except BudgetExceeded:
+                raise
+            except Exception:
                 return False
-    
+
+    async def direct_add_to_cart(self, add_url, confirmation, cart_count=None, timeout=8000):
+        """Add an item through the storefront cart URL without rendering the product page.
+
+        Uses the context's request API, so the session cookies are sent and any
+        cookies set by the response land back in the browser context. The add
+        counts only when the response has a `confirmation` element and, if it
+        shows a `cart_count`, a non-empty cart.
+        """
+        try:
+            with self.track(NAVIGATION, f"request {urlparse(add_url).path}", url=add_url):
+                response = await self.page.context.request.get(add_url, timeout=self.clamp_timeout(timeout))
+            if not response.ok:
+                print(f"⚠️ Direct add-to-cart returned HTTP {response.status}")
+                return False
+            html = await response.text()
+            soup = await asyncio.to_thread(BeautifulSoup, html, HTML_PARSER)
+            added = FetchedPage(url=response.url, status=response.status, soup=soup)
+            if not added.count(confirmation):
+                print("⚠️ Direct add-to-cart response has no confirmation")
+                return False
+            counts = added.select(cart_count) if cart_count else []
+            if counts and not (counts[0].isdigit() and int(counts[0]) > 0):
+                print(f"⚠️ Direct add-to-cart confirmed, but the cart count is {counts[0]!r}")
+                return False
+            return True
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"⚠️ Direct add-to-cart error: {e}")
+            return False
+
+    async def fetch_page(self, url, timeout=8000):
+        """Fetch and parse a page with the context's cookies, leaving the rendered page untouched.
+
+        Only plain CSS selectors work on the result; Playwright-only pseudo
+        classes such as :has-text() are not understood by the parser.
+        """
+        try:
+            with self.track(NAVIGATION, f"request {urlparse(url).path}", url=url):
+                response = await self.page.context.request.get(url, timeout=self.clamp_timeout(timeout))
+            if not response.ok:
+                print(f"⚠️ Fetch of {url} returned HTTP {response.status}")
+                return None
+            html = await response.text()
+            # Parsing is CPU bound, keep it off the event loop
+            soup = await asyncio.to_thread(BeautifulSoup, html, HTML_PARSER)
+            return FetchedPage(url=response.url, status=response.status, soup=soup)
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"⚠️ Fetch error: {e}")
+            return None
+
+    async def recover(self, level):
+        """Replace the working page, its context or the whole browser, then reopen the last URL"""
+        with self.track(LAUNCH, f"recover {level}"):
+            if level == 'page':
+                await self.recycle_page()
+            elif level == 'context':
+                await self.recycle_context()
+            else:
+                await self.relaunch_browser()
+            if self.last_url:
+                await self._navigate(self.page, self.last_url, 12000)
+        return self.page
+
+    async def recycle_page(self):
+        """New prepared tab in the same context; the old one is closed if it still can be"""
+        old_page = self.page
+        self.page = await old_page.context.new_page()
+        await self._prepare_page(self.page)
+        try:
+            await old_page.close()
+        except Exception:
+            pass  # Crashed pages may refuse to close
+
+    async def recycle_context(self):
+        """New context with the old one's cookies when they can still be read (fresh contexts only)"""
+        if self.launch_options.get('persistent'):
+            raise RuntimeError("a persistent context is the browser; relaunch instead")
+        try:
+            storage_state = await self.context.storage_state()
+        except Exception:
+            storage_state = self.launch_options.get('storage_state')
+        try:
+            await self.context.close()
+        except Exception:
+            pass
+        self.context = await self.browser.new_context(storage_state=storage_state, **self.context_options)
+        self.page = await self.context.new_page()
+        # A new context has its own connection pool
+        self._start_prewarm(self.context, self.launch_options.get('warm_origins'))
+        await self._prepare_page(self.page)
+
+    async def relaunch_browser(self):
+        """Tear down whatever is left of the browser and driver and start again with the same options"""
+        for closable in (self.context, self.browser):
+            try:
+                if closable:
+                    await closable.close()
+            except Exception:
+                pass
+        try:
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception:
+            pass
+        self.context = self.browser = self.playwright = None
+        options = self.launch_options
+        await self._start_browser(options.get('persistent', True), options.get('headless', False),
+                                  options.get('storage_state'), options.get('warm_origins'))
+
     async def close_browser(self):
         """Close browser and cleanup"""
+        if self.watchdog:
+            # Closing must not look like a crash
+            await self.watchdog.stop()
+        if self.prewarm_task and not self.prewarm_task.done():
+            self.prewarm_task.cancel()
         try:
             if self.context:
                 await self.context.close()
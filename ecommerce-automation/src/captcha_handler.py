@@ -7,8 +7,10 @@ from PIL import Image
 import openai
 
 class CaptchaHandler:
-    def __init__(self, page):
+    def __init__(self, page, interactive=True):
         self.page = page
+        # Never wait for a human when running unattended
+        self.interactive = interactive
         self.openai_client = None
         self.setup_openai()
     
@@ -195,7 +197,7 @@ class CaptchaHandler:
             print("Please solve the captcha manually in the browser window.")
             import sys
             try:
-                if sys.stdin.isatty():
+                if self.interactive and sys.stdin.isatty():
                     input("Press Enter once you've solved it...")
             except EOFError:
                 pass
@@ -221,7 +223,7 @@ class CaptchaHandler:
                     print("Please complete the reCAPTCHA manually in the browser window.")
                     import sys
                     try:
-                        if sys.stdin.isatty():
+                        if self.interactive and sys.stdin.isatty():
                             input("Press Enter once you've completed the reCAPTCHA...")
                     except EOFError:
                         pass
@@ -255,7 +257,7 @@ class CaptchaHandler:
             print("⚠️ Manual captcha solving required")
             import sys
             try:
-                if sys.stdin.isatty():
+                if self.interactive and sys.stdin.isatty():
                     input("Press Enter once you've solved the captcha...")
             except EOFError:
                 pass
@@ -0,0 +1,141 @@
+# src/cpu_profiler.py - Low-overhead sampling profiler for the event loop thread, grouped by flow phase
+import asyncio
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from performance_monitor import IDLE_PHASE
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IDLE_FRAME = '<idle: waiting for I/O>'
+# The event loop's own frames, dropped so stacks start at the coroutine a task is running
+ASYNCIO_DIR = os.sep + 'asyncio' + os.sep
+LOOP_FRAMES = {'run_until_complete', 'run_forever', '_run_once', '_run', 'run', '__step', '__step_run_and_handle_result'}
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    if path.startswith(PROJECT_ROOT) and 'site-packages' not in path:
+        path = os.path.relpath(path, PROJECT_ROOT)
+    elif 'site-packages' in path:
+        path = path.split('site-packages' + os.sep, 1)[1]
+    else:
+        path = os.path.basename(path)
+    return f"{path}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Samples the event loop thread's Python stack every `interval` seconds from a watcher thread.
+
+    Each sample is filed under the flow phase running at the time. Samples
+    taken while the loop waits in its selector count as idle, so the report
+    separates Python CPU time from time spent waiting on the browser. Stacks
+    are cut at the loop internals and start at the running coroutine; the
+    coroutines it awaits follow, as they are on the stack while it runs.
+    Work handed to asyncio.to_thread (HTML parsing) runs elsewhere and is not sampled.
+    """
+
+    def __init__(self, monitor, interval=0.005):
+        self.monitor = monitor
+        self.interval = interval
+        self.stacks: Dict[Tuple[str, ...], int] = {}
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._loop_thread_id = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _stack(self, frame) -> List[str]:
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+        top = codes[-1] if codes else None
+        if top and top.co_filename.endswith('selectors.py'):
+            return [IDLE_FRAME]
+        # Keep what runs after the innermost loop frame
+        start = 0
+        for index, code in enumerate(codes):
+            if code.co_name in LOOP_FRAMES and ASYNCIO_DIR in code.co_filename:
+                start = index + 1
+        return [_frame_label(code) for code in codes[start:]] or ['<event loop>']
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            phase = self.monitor.current_operation or IDLE_PHASE
+            key = (phase,) + tuple(self._stack(frame))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name='cpu-profiler', daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+        self.elapsed = time.perf_counter() - self.started
+
+    def write_collapsed(self, path: str):
+        """Brendan Gregg's collapsed format, one 'frame;frame;frame count' line per stack"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: item[1], reverse=True):
+                f.write(';'.join(stack) + f" {count}\n")
+
+    def busy_by_phase(self) -> Dict[str, Tuple[int, int]]:
+        """{phase: (busy samples, all samples)}"""
+        totals: Dict[str, Tuple[int, int]] = {}
+        for (phase, *frames), count in self.stacks.items():
+            busy, total = totals.get(phase, (0, 0))
+            totals[phase] = (busy + (0 if frames == [IDLE_FRAME] else count), total + count)
+        return totals
+
+    def hotspots(self, top=15) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """Top (frame, samples) by self time and by inclusive time, idle samples left out"""
+        own: Dict[str, int] = {}
+        inclusive: Dict[str, int] = {}
+        for (phase, *frames), count in self.stacks.items():
+            if frames == [IDLE_FRAME]:
+                continue
+            own[frames[-1]] = own.get(frames[-1], 0) + count
+            for frame in set(frames):
+                inclusive[frame] = inclusive.get(frame, 0) + count
+        by_count = lambda item: item[1]
+        return (sorted(own.items(), key=by_count, reverse=True)[:top],
+                sorted(inclusive.items(), key=by_count, reverse=True)[:top])
+
+    def print_summary(self, top=15):
+        if not self.samples:
+            return
+        # The sampler can fall behind its interval, so scale samples to the measured time
+        seconds_per_sample = self.elapsed / self.samples
+        print("\n" + "="*78)
+        print(f"🔥 CPU PROFILE ({self.samples} samples over {self.elapsed:.2f}s, "
+              f"~{seconds_per_sample * 1000:.1f}ms each)")
+        print("="*78)
+        print(f"{'Phase':<24}{'busy s':>10}{'idle s':>10}{'busy %':>10}")
+        for phase, (busy, total) in self.busy_by_phase().items():
+            print(f"{phase:<24}{busy * seconds_per_sample:>10.3f}{(total - busy) * seconds_per_sample:>10.3f}"
+                  f"{busy / total:>10.1%}")
+        own, inclusive = self.hotspots(top)
+        for title, rows in (('self', own), ('inclusive', inclusive)):
+            print(f"\nTop {len(rows)} by {title} time:")
+            for frame, count in rows:
+                print(f"  {count * seconds_per_sample:8.3f}s  {frame}")
+        print("="*78)
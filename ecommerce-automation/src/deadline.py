@@ -0,0 +1,77 @@
+# src/deadline.py - End-to-end time budget split into per-step budgets
+import time
+from typing import Dict, List, Optional
+
+
+class BudgetExceeded(Exception):
+    """Raised when a step has no time left in its budget"""
+
+    def __init__(self, step: Optional[str]):
+        super().__init__(f"Time budget exhausted during {step or 'run'}")
+        self.step = step
+
+
+class Deadline:
+    """Overall run deadline that hands each flow step a share of the time left.
+
+    A step's budget is its weight's share of the remaining time among the
+    steps not started yet, so time saved early rolls over to later steps.
+    Every timeout and sleep inside a step is clamped to what is left of it.
+    """
+
+    def __init__(self, total_seconds: float, step_order: List[str],
+                 step_weights: Dict[str, float], clock=time.monotonic):
+        self.total_seconds = total_seconds
+        self.step_order = step_order
+        self.step_weights = step_weights
+        self.clock = clock
+        self.started_at = clock()
+        self.expires_at = self.started_at + total_seconds
+        self.step: Optional[str] = None
+        self.step_expires_at = self.expires_at
+        self.step_budgets: Dict[str, float] = {}
+        self.exhausted_step: Optional[str] = None
+
+    def remaining(self) -> float:
+        """Seconds left of the overall deadline"""
+        return max(0.0, self.expires_at - self.clock())
+
+    def step_remaining(self) -> float:
+        """Seconds left of the current step's budget"""
+        return max(0.0, min(self.step_expires_at, self.expires_at) - self.clock())
+
+    def begin_step(self, step: str) -> float:
+        """Allot `step` its share of the remaining time and return the budget in seconds"""
+        upcoming = self.step_order[self.step_order.index(step):] if step in self.step_order else [step]
+        total_weight = sum(self.step_weights.get(name, 1.0) for name in upcoming)
+        share = self.step_weights.get(step, 1.0) / total_weight if total_weight else 1.0
+        budget = self.remaining() * share
+        self.step = step
+        self.step_expires_at = self.clock() + budget
+        self.step_budgets[step] = self.step_budgets.get(step, 0.0) + budget
+        return budget
+
+    def end_step(self):
+        self.step = None
+        self.step_expires_at = self.expires_at
+
+    def exhausted(self, step: Optional[str] = None) -> BudgetExceeded:
+        """Record which step ran out of time and build the exception to raise"""
+        step = step or self.step
+        if self.exhausted_step is None:
+            self.exhausted_step = step
+        return BudgetExceeded(step)
+
+    def clamp_ms(self, timeout_ms: float) -> int:
+        """Clamp a Playwright timeout (ms) to the step budget; raises when nothing is left"""
+        remaining_ms = int(self.step_remaining() * 1000)
+        if remaining_ms <= 0:
+            raise self.exhausted()
+        return min(int(timeout_ms), remaining_ms)
+
+    def clamp_seconds(self, seconds: float) -> float:
+        """Clamp a sleep (s) to the step budget; raises when nothing is left"""
+        remaining = self.step_remaining()
+        if remaining <= 0:
+            raise self.exhausted()
+        return min(seconds, remaining)
@@ -0,0 +1,174 @@
+# src/health_watchdog.py - Periodic driver/browser/page health checks with automatic recovery
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from performance_monitor import IDLE_PHASE
+
+# Recovery levels, cheapest first; a failed level escalates to the next
+LEVELS = ('page', 'context', 'browser')
+FIRST_LEVEL = {
+    'page_crashed': 'page',
+    'page_closed': 'page',
+    'page_hung': 'page',
+    'browser_disconnected': 'browser',
+}
+# Errors that mean the driver or browser is gone rather than the page being busy
+DEAD_DRIVER_MESSAGES = ('Connection closed', 'Browser has been closed', 'Playwright connection closed',
+                        'browser has disconnected')
+
+
+@dataclass
+class Recovery:
+    problem: str
+    level: Optional[str]         # Level that recovered, None when every level failed
+    phase: str
+    detection_seconds: float     # From the last healthy check to detection
+    seconds: float               # Time spent recovering
+    success: bool
+
+
+class BrowserWatchdog:
+    """Health checks for an AdvancedBrowserManager every `interval` seconds, with recovery.
+
+    Renderer crashes are caught by the page's crash event and handled at the
+    next tick. A probe evaluating `1` in the page, bounded by `probe_timeout`,
+    catches hangs: `hung_after` probes in a row that time out count as a hang.
+    Detection latency is therefore at most `interval` for crashes, closed
+    pages and a disconnected browser, and `hung_after * (interval +
+    probe_timeout)` for hangs. Probes that fail because a navigation replaced
+    the document count as healthy.
+
+    `on_problem` callbacks run before a recovery starts, so a step can stop
+    using the failing page; `on_recovery` callbacks get the Recovery once it
+    is over, successful or not.
+    """
+
+    def __init__(self, manager, monitor, interval=2.0, probe_timeout=5.0, hung_after=2, step_restarts=2):
+        self.manager = manager
+        self.monitor = monitor
+        self.clock = monitor.clock
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.hung_after = hung_after
+        # How often the flow may restart one step after recoveries
+        self.step_restarts = step_restarts
+        self.recoveries: List[Recovery] = []
+        # Called with the problem before recovering, and with the Recovery after
+        self.on_problem: List[Callable] = []
+        self.on_recovery: List[Callable] = []
+        self._watched_page = None
+        self._crashed_page = None
+        self._misses = 0
+        self._last_healthy = None
+        self._task = None
+
+    def _watch_page(self, page):
+        self._watched_page = page
+        self._misses = 0
+        page.on('crash', lambda crashed: setattr(self, '_crashed_page', crashed))
+
+    def _browser_connected(self) -> bool:
+        browser = self.manager.browser
+        if hasattr(browser, 'is_connected'):
+            return browser.is_connected()
+        # A persistent context stands in for the browser
+        owner = getattr(browser, 'browser', None)
+        return owner.is_connected() if owner else True
+
+    async def check(self) -> Optional[str]:
+        """One health check; returns the problem found, or None when healthy"""
+        page = self.manager.page
+        if page is None or self.manager.browser is None:
+            return None
+        if page is not self._watched_page:
+            self._watch_page(page)
+        if not self._browser_connected():
+            return 'browser_disconnected'
+        if self._crashed_page is page:
+            return 'page_crashed'
+        if page.is_closed():
+            return 'page_closed'
+        try:
+            await asyncio.wait_for(page.evaluate('1'), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            self._misses += 1
+            return 'page_hung' if self._misses >= self.hung_after else None
+        except Exception as e:
+            if any(message in str(e) for message in DEAD_DRIVER_MESSAGES):
+                return 'browser_disconnected'
+            if page.is_closed():
+                return 'page_closed'
+            # Execution context destroyed by a navigation: the page is busy, not broken
+        self._misses = 0
+        return None
+
+    async def recover(self, problem: str) -> Recovery:
+        phase = self.monitor.current_operation or IDLE_PHASE
+        detected = self.clock()
+        detection = detected - self._last_healthy if self._last_healthy is not None else 0.0
+        print(f"🚑 Browser health check failed ({problem}) during {phase}, recovering...")
+        for callback in self.on_problem:
+            callback(problem)
+        recovered_at = None
+        for level in LEVELS[LEVELS.index(FIRST_LEVEL[problem]):]:
+            if level == 'context' and self.manager.launch_options.get('persistent'):
+                continue
+            try:
+                await self.manager.recover(level)
+                recovered_at = level
+                break
+            except Exception as e:
+                print(f"⚠️ {level} recovery failed: {e}")
+        recovery = Recovery(problem=problem, level=recovered_at, phase=phase, detection_seconds=detection,
+                            seconds=self.clock() - detected, success=recovered_at is not None)
+        self.recoveries.append(recovery)
+        self.monitor.count('recoveries')
+        self.monitor.set_attribute('recovery_seconds', round(recovery.seconds, 3))
+        if self.monitor.registry:
+            self.monitor.registry.observe('recovery_seconds', (('level', recovered_at or 'failed'),), recovery.seconds)
+        if recovery.success:
+            print(f"✅ Recovered by {recovered_at} in {recovery.seconds:.2f}s")
+        else:
+            print(f"❌ Could not recover from {problem}")
+        for callback in self.on_recovery:
+            callback(recovery)
+        return recovery
+
+    async def _watch(self):
+        self._last_healthy = self.clock()
+        while True:
+            await asyncio.sleep(self.interval)
+            problem = await self.check()
+            if problem is None:
+                self._last_healthy = self.clock()
+                continue
+            await self.recover(problem)
+            self._crashed_page = None
+            self._last_healthy = self.clock()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def print_summary(self):
+        if not self.recoveries:
+            return
+        print("\n" + "="*72)
+        print(f"🚑 BROWSER RECOVERIES ({len(self.recoveries)})")
+        print("="*72)
+        for recovery in self.recoveries:
+            outcome = f"by {recovery.level}" if recovery.success else "FAILED"
+            print(f"  - {recovery.problem} during {recovery.phase}: detected after {recovery.detection_seconds:.2f}s, "
+                  f"recovered {outcome} in {recovery.seconds:.2f}s")
+        print("="*72)
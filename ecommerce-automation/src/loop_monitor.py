@@ -0,0 +1,136 @@
+# src/loop_monitor.py - Event-loop lag measurement and blocking-call detection (debug mode)
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from performance_monitor import IDLE_PHASE
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class LoopStall:
+    duration: float
+    phase: str
+    location: str
+    stack: List[str]
+
+
+class LoopStallDetector:
+    """Finds callbacks that hold the asyncio event loop longer than a threshold.
+
+    A heartbeat task wakes every `interval` and records how late it woke up
+    (the loop lag). A watchdog thread notices when a heartbeat is overdue by
+    more than `threshold` and grabs the loop thread's stack right then, while
+    the blocking call is still on it. The heartbeat closes the stall with its
+    measured length once the loop is free again.
+    """
+
+    def __init__(self, monitor, threshold=0.1, interval=0.02):
+        self.monitor = monitor
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls: List[LoopStall] = []
+        self.lags: List[float] = []
+        self._lock = threading.Lock()
+        self._pending_stack: Optional[List[str]] = None
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - self._last_beat - self.interval
+            self.lags.append(max(0.0, lag))
+            if lag >= self.threshold:
+                self._close_stall(lag)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval / 2):
+            overdue = time.perf_counter() - self._last_beat - self.interval
+            if overdue < self.threshold:
+                continue
+            with self._lock:
+                if self._pending_stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                self._pending_stack = traceback.format_stack(frame) if frame else []
+
+    def _close_stall(self, lag):
+        with self._lock:
+            stack, self._pending_stack = self._pending_stack, None
+        phase = self.monitor.current_operation or IDLE_PHASE
+        # Stalls shorter than a watchdog tick can end before their stack is caught
+        location = self._location(stack) if stack else 'unknown (ended before capture)'
+        self.stalls.append(LoopStall(duration=lag, phase=phase, location=location, stack=stack or []))
+        self.monitor.count('loop_stalls')
+        print(f"🐢 Event loop blocked {lag*1000:.0f}ms during {phase} at {location}")
+
+    @staticmethod
+    def _location(stack):
+        """Innermost project frame of a formatted stack, e.g. 'main.py:194 in automate_checkout'"""
+        frames = [line.strip().splitlines()[0] for line in stack]
+        for line in reversed(frames):
+            # '  File "/path/main.py", line 194, in automate_checkout'
+            path = line.split('"')[1] if line.startswith('File "') else ''
+            if path.startswith(PROJECT_ROOT) and 'site-packages' not in path and not path.endswith('loop_monitor.py'):
+                number = line.split(', line ')[1].split(',')[0]
+                function = line.rsplit(' in ', 1)[-1]
+                return f"{os.path.relpath(path, PROJECT_ROOT)}:{number} in {function}"
+        return frames[-1] if frames else 'unknown'
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._last_beat = time.perf_counter()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join()
+
+    def blocked_by_location(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for stall in self.stalls:
+            totals[stall.location] = totals.get(stall.location, 0.0) + stall.duration
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def print_summary(self):
+        print("\n" + "="*60)
+        print("🐢 EVENT LOOP STALLS")
+        print("="*60)
+        if self.lags:
+            ordered = sorted(self.lags)
+            p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+            print(f"Loop lag: max {ordered[-1]*1000:.1f}ms, p99 {p99*1000:.1f}ms over {len(ordered)} heartbeats")
+        total = sum(stall.duration for stall in self.stalls)
+        print(f"Blocked ≥{self.threshold*1000:.0f}ms: {len(self.stalls)} time(s), {total:.3f}s in total")
+        for location, seconds in self.blocked_by_location().items():
+            count = sum(1 for stall in self.stalls if stall.location == location)
+            print(f"  {seconds:8.3f}s  {count:3d}x  {location}")
+        longest = max(self.stalls, key=lambda stall: stall.duration, default=None)
+        if longest and longest.stack:
+            print(f"\nLongest stall ({longest.duration:.3f}s during {longest.phase}):")
+            print(''.join(longest.stack[-6:]).rstrip())
+        print("="*60)
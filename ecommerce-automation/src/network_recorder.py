@@ -0,0 +1,142 @@
+# src/network_recorder.py - Per-request network timing and size, aggregated by phase, domain and type
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from performance_monitor import IDLE_PHASE, MB
+
+
+@dataclass
+class RequestRecord:
+    phase: str
+    url: str
+    domain: str
+    resource_type: str
+    status: Optional[int]
+    bytes: int
+    seconds: float
+    failure: Optional[str] = None
+
+
+@dataclass
+class TrafficTotals:
+    requests: int = 0
+    failed: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def add(self, record: RequestRecord):
+        self.requests += 1
+        self.failed += 1 if record.failure else 0
+        self.bytes += record.bytes
+        self.seconds += record.seconds
+
+
+class NetworkRecorder:
+    """Records every request a browser context makes and which flow phase it belonged to.
+
+    Sizes come from request.sizes(), one extra protocol round trip per
+    request, so this is opt-in. Requests aborted by the resource blocking
+    show up as failed with Chromium's net::ERR_FAILED.
+    """
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.records: List[RequestRecord] = []
+        self._pending = set()
+        # Phase each in-flight request was sent in, until it finishes or fails
+        self._sent_in = {}
+        self._contexts = []
+
+    def attach(self, context):
+        """Record a context's requests; contexts already attached are skipped"""
+        if context in self._contexts:
+            return
+        self._contexts.append(context)
+        context.on('request', self._stamp)
+        context.on('requestfinished', lambda request: self._collect(request, None))
+        context.on('requestfailed', lambda request: self._collect(request, request.failure))
+
+    def _stamp(self, request):
+        self._sent_in[request] = self.monitor.current_operation or IDLE_PHASE
+
+    def _collect(self, request, failure):
+        # A request finishing in a later phase still belongs to the one that sent it
+        phase = self._sent_in.pop(request, None) or self.monitor.current_operation or IDLE_PHASE
+        task = asyncio.ensure_future(self._record(request, phase, failure))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _record(self, request, phase, failure):
+        status, size = None, 0
+        try:
+            if failure is None:
+                response = await request.response()
+                status = response.status if response else None
+                sizes = await request.sizes()
+                size = sizes['responseBodySize'] + sizes['responseHeadersSize']
+        except Exception:
+            pass  # The page or context went away before the details could be read
+        timing = request.timing
+        # responseEnd is relative to startTime, in ms; -1 when the request never finished
+        seconds = max(0.0, timing.get('responseEnd', -1)) / 1000
+        self.records.append(RequestRecord(
+            phase=phase,
+            url=request.url,
+            domain=urlparse(request.url).hostname or '',
+            resource_type=request.resource_type,
+            status=status,
+            bytes=size,
+            seconds=seconds,
+            failure=failure,
+        ))
+
+    async def flush(self):
+        """Wait for details of requests that already finished"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def totals(self, key: str) -> Dict[Tuple[str, str], TrafficTotals]:
+        """{(phase, domain or resource type): totals}; key is 'domain' or 'resource_type'"""
+        totals: Dict[Tuple[str, str], TrafficTotals] = {}
+        for record in self.records:
+            totals.setdefault((record.phase, getattr(record, key)), TrafficTotals()).add(record)
+        return totals
+
+    def summary(self, top: int = 5) -> Dict[str, Dict[str, list]]:
+        """{phase: {'domains': [...], 'types': [...]}} with the top entries by bytes"""
+        report: Dict[str, Dict[str, list]] = {}
+        for key, label in (('domain', 'domains'), ('resource_type', 'types')):
+            for (phase, name), totals in self.totals(key).items():
+                report.setdefault(phase, {}).setdefault(label, []).append({
+                    'name': name, 'requests': totals.requests, 'failed': totals.failed,
+                    'bytes': totals.bytes, 'seconds': round(totals.seconds, 3),
+                })
+        for phase in report.values():
+            for label, rows in phase.items():
+                rows.sort(key=lambda row: (row['bytes'], row['seconds']), reverse=True)
+                del rows[top:]
+        return report
+
+    def print_report(self, top: int = 5):
+        if not self.records:
+            return
+        print("\n" + "="*78)
+        print(f"🌐 NETWORK ({len(self.records)} requests, "
+              f"{sum(record.bytes for record in self.records) / MB:.2f} MB)")
+        print("="*78)
+        for phase, tables in self.summary(top).items():
+            print(f"\n{phase}:")
+            for label, rows in tables.items():
+                print(f"  {'Top ' + label:<40}{'reqs':>6}{'failed':>8}{'KB':>10}{'time s':>10}")
+                for row in rows:
+                    print(f"  {row['name'][:40]:<40}{row['requests']:>6}{row['failed']:>8}"
+                          f"{row['bytes'] / 1024:>10.1f}{row['seconds']:>10.3f}")
+        slowest = sorted((record for record in self.records if not record.failure),
+                         key=lambda record: record.seconds, reverse=True)[:top]
+        if slowest:
+            print(f"\n🐌 Slowest requests:")
+            for record in slowest:
+                print(f"  - {record.seconds:.3f}s {record.resource_type} {record.url[:90]} ({record.phase})")
+        print("="*78)
@@ -0,0 +1,160 @@
+# src/openmetrics.py - Constant-memory step histograms and counters, served in OpenMetrics text format
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence, Tuple
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed buckets plus sum and count; memory does not grow with observations"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)   # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, +Inf last"""
+        total, buckets = 0, []
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            buckets.append(('+Inf' if bound == float('inf') else repr(float(bound)), total))
+        return buckets
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _family_name(name: str) -> str:
+    return ''.join(c if c.isalnum() else '_' for c in name).strip('_').lower()
+
+
+class MetricsRegistry:
+    """Process-wide step duration histograms and event counters, fed by PerformanceMonitor.
+
+    Series are keyed by step and counter name, both fixed by the code, so
+    memory stays constant however many runs a process makes. Reads from the
+    HTTP thread and writes from the event loop share one lock.
+    """
+
+    def __init__(self, buckets: Sequence[float], prefix: str = 'checkout'):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.help: Dict[str, str] = {
+            'step_duration_seconds': 'Wall time of each flow step',
+            'recovery_seconds': 'Time to recover the browser after a failed health check',
+            'step_results': 'Finished steps by result',
+            'runs': 'Finished checkout runs by status',
+            'retries': 'Retried attempts by step',
+            'circuit_open': 'Attempts skipped by an open circuit breaker',
+            'blocked_requests': 'Requests aborted by resource blocking',
+            'loop_stalls': 'Event loop stalls over the threshold',
+            'recoveries': 'Browser, context or page recoveries by step',
+        }
+        self._lock = threading.Lock()
+
+    def observe(self, family: str, labels: Labels, seconds: float):
+        """Add a duration to a histogram family (names end in _seconds)"""
+        with self._lock:
+            series = self.histograms.setdefault(_family_name(family), {})
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_step(self, step: str, seconds: float, success: bool):
+        self.observe('step_duration_seconds', (('step', step),), seconds)
+        self.increment('step_results', (('step', step), ('result', 'success' if success else 'failure')))
+
+    def increment(self, family: str, labels: Labels = (), amount: float = 1):
+        family = _family_name(family)
+        with self._lock:
+            series = self.counters.setdefault(family, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def count_event(self, name: str, phase: str, amount: float = 1):
+        """A PerformanceMonitor counter: 'retries.login' becomes retries_total{step="login"}"""
+        family, _, step = name.partition('.')
+        self.increment(family, (('step', step or phase),), amount)
+
+    def render(self) -> str:
+        """All series as an OpenMetrics text exposition"""
+        lines = []
+        with self._lock:
+            for family, series in sorted(self.histograms.items()):
+                name = f"{self.prefix}_{family}"
+                lines += [f"# TYPE {name} histogram", f"# UNIT {name} seconds",
+                          f"# HELP {name} {self.help.get(family, family.replace('_', ' ').capitalize())}"]
+                for labels, histogram in sorted(series.items()):
+                    for le, total in histogram.cumulative():
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {total}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+            for family, series in sorted(self.counters.items()):
+                name = f"{self.prefix}_{family}"
+                lines += [f"# TYPE {name} counter",
+                          f"# HELP {name} {self.help.get(family, family.replace('_', ' ').capitalize())}"]
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}_total{_format_labels(labels)} {value}")
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = None
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would drown the flow's output
+
+
+class MetricsServer:
+    """Serves a registry at http://<host>:<port>/metrics from a daemon thread"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1', port: int = 9464):
+        handler = type('BoundMetricsHandler', (MetricsHandler,), {'registry': registry})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,5 +1,6 @@
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs, urlencode
 import re
+from config.settings import PLATFORMS
 
 class PlatformDetector:
     @staticmethod
@@ -7,6 +8,11 @@ class PlatformDetector:
         """Detect e-commerce platform from URL"""
         domain = urlparse(product_url).netloc.lower()
         
+        # Configured origins first, so a local stand-in storefront is recognized
+        for platform, config in PLATFORMS.items():
+            if urlparse(config['base_url']).netloc.lower() == domain:
+                return platform
+        
         if 'amazon' in domain:
             return 'amazon'
         elif 'flipkart' in domain:
@@ -20,11 +26,33 @@ class PlatformDetector:
     def extract_product_id(product_url, platform):
         """Extract product ID from URL"""
         if platform == 'amazon':
-            match = re.search(r'/dp/([A-Z0-9]{10})', product_url)
+            match = re.search(r'/(?:dp|gp/product)/([A-Z0-9]{10})', product_url)
             return match.group(1) if match else None
         
         elif platform == 'flipkart':
-            match = re.search(r'/p/([^?]+)', product_url)
+            match = re.search(r'/p/([^?/]+)', product_url)
             return match.group(1) if match else None
         
-        return None
\ No newline at end of file
+        return None
+    
+    @staticmethod
+    def canonical_product_url(product_url, platform):
+        """Normalize a product URL to its short form without tracking parameters"""
+        parsed = urlparse(product_url)
+        product_id = PlatformDetector.extract_product_id(product_url, platform)
+        if not product_id:
+            return product_url
+        
+        origin = f"{parsed.scheme or 'https'}://{parsed.netloc}"
+        if platform == 'amazon':
+            return f"{origin}/dp/{product_id}"
+        
+        elif platform == 'flipkart':
+            # The listing id (pid) picks the variant, everything else is tracking
+            match = re.search(r'^(.*?/p/[^?/]+)', parsed.path)
+            path = match.group(1) if match else parsed.path
+            pid = parse_qs(parsed.query).get('pid')
+            query = f"?{urlencode({'pid': pid[0]})}" if pid else ''
+            return f"{origin}{path}{query}"
+        
+        return product_url
\ No newline at end of file
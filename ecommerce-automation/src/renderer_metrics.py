@@ -0,0 +1,91 @@
+# src/renderer_metrics.py - Chromium renderer metrics (DevTools Performance domain) per flow phase
+from typing import Dict, Optional
+
+from performance_monitor import IDLE_PHASE, MB
+
+# Cumulative counters: a phase gets the difference between its boundaries
+CUMULATIVE = {
+    'ScriptDuration': ('script_ms', 1000),
+    'TaskDuration': ('task_ms', 1000),
+    'LayoutDuration': ('layout_ms', 1000),
+    'RecalcStyleDuration': ('style_ms', 1000),
+    'LayoutCount': ('layouts', 1),
+    'RecalcStyleCount': ('restyles', 1),
+}
+# Point-in-time values: a phase gets the value at its end
+GAUGES = {
+    'JSHeapUsedSize': ('js_heap_mb', 1 / MB),
+    'Nodes': ('dom_nodes', 1),
+}
+COLUMNS = [name for name, _ in CUMULATIVE.values()] + [name for name, _ in GAUGES.values()]
+
+
+def cumulative_deltas(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
+    """Scaled CUMULATIVE differences; a counter that went down was reset by a new renderer, so its new value counts"""
+    deltas = {}
+    for metric, (column, scale) in CUMULATIVE.items():
+        start, end = before.get(metric, 0.0), after.get(metric, 0.0)
+        deltas[column] = (end - start if end >= start else end) * scale
+    return deltas
+
+
+class RendererMetrics:
+    """Samples Performance.getMetrics over a CDP session at phase boundaries.
+
+    One session per page; when the flow moves to another tab the next
+    snapshot attaches to it and that phase's counters start from zero.
+    Non-Chromium browsers have no CDP, which turns sampling off for the run.
+    """
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.available = True
+        self.attached = False
+        self.session = None
+        self.page = None
+        # phase -> column -> value (summed over repeated phases, gauges keep the last)
+        self.phases: Dict[str, Dict[str, float]] = {}
+
+    async def snapshot(self, page) -> Optional[dict]:
+        if not self.available or page is None:
+            return None
+        try:
+            if page is not self.page:
+                self.session = await page.context.new_cdp_session(page)
+                await self.session.send('Performance.enable')
+                self.page = page
+                self.attached = True
+            response = await self.session.send('Performance.getMetrics')
+        except Exception as e:
+            if not self.attached:
+                print(f"⚠️ Renderer metrics unavailable ({e.__class__.__name__}), not sampling")
+                self.available = False
+            # A closed tab: attach again on the next snapshot
+            self.page = self.session = None
+            return None
+        return {'page': page, 'values': {metric['name']: metric['value'] for metric in response['metrics']}}
+
+    def record(self, before: Optional[dict], after: Optional[dict]):
+        """Attribute the change between two snapshots to the running phase and its span"""
+        if after is None:
+            return
+        baseline = before['values'] if before and before['page'] is after['page'] else {}
+        row = self.phases.setdefault(self.monitor.current_operation or IDLE_PHASE, {})
+        for column, delta in cumulative_deltas(baseline, after['values']).items():
+            row[column] = row.get(column, 0.0) + delta
+            self.monitor.set_attribute(f"renderer_{column}", round(delta, 1))
+        for metric, (column, scale) in GAUGES.items():
+            if metric in after['values']:
+                row[column] = after['values'][metric] * scale
+                self.monitor.set_attribute(f"renderer_{column}", round(row[column], 1))
+
+    def print_report(self):
+        if not self.phases:
+            return
+        print("\n" + "="*104)
+        print("🖥️ RENDERER (Chromium Performance metrics per phase)")
+        print("="*104)
+        print(f"{'Phase':<20}" + ''.join(f"{column:>12}" for column in COLUMNS))
+        for phase, row in self.phases.items():
+            print(f"{phase:<20}" + ''.join(f"{row.get(column, 0.0):>12.1f}" for column in COLUMNS))
+        print("="*104)
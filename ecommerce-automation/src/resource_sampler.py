@@ -0,0 +1,91 @@
+# src/resource_sampler.py - Memory and CPU sampling of the Chromium processes
+import asyncio
+import os
+import psutil
+
+BROWSER_PROCESS_NAMES = ('chrome', 'chromium', 'headless_shell')
+
+
+class BrowserResourceSampler:
+    """Periodically samples RSS and CPU time of the browser and its child processes.
+
+    Chromium is launched by the Playwright driver, which is itself a child of
+    this Python process, so every browser process shows up among our
+    descendants. Samples are attributed to the monitor's current operation.
+    """
+
+    def __init__(self, monitor, interval=0.25):
+        self.monitor = monitor
+        self.interval = interval
+        self._task = None
+        self._roles = {}
+        self._cpu_seen = {}
+
+    def _browser_processes(self):
+        processes = []
+        try:
+            children = psutil.Process(os.getpid()).children(recursive=True)
+        except psutil.Error:
+            return processes
+        for child in children:
+            try:
+                if any(name in child.name().lower() for name in BROWSER_PROCESS_NAMES):
+                    processes.append(child)
+            except psutil.Error:
+                continue
+        return processes
+
+    def _role(self, process):
+        """'renderer' for renderer children, 'browser' for everything else (cached per pid)"""
+        if process.pid not in self._roles:
+            try:
+                cmdline = process.cmdline()
+            except psutil.Error:
+                cmdline = []
+            self._roles[process.pid] = 'renderer' if '--type=renderer' in cmdline else 'browser'
+        return self._roles[process.pid]
+
+    def sample(self):
+        """Take one sample: (total RSS bytes, renderer RSS bytes, CPU seconds since last sample)"""
+        total_rss = renderer_rss = 0
+        cpu_delta = 0.0
+        for process in self._browser_processes():
+            try:
+                with process.oneshot():
+                    rss = process.memory_info().rss
+                    times = process.cpu_times()
+            except psutil.Error:
+                continue
+            # RSS is summed across processes, so shared pages are counted more than once
+            total_rss += rss
+            if self._role(process) == 'renderer':
+                renderer_rss += rss
+            cpu = times.user + times.system
+            cpu_delta += cpu - self._cpu_seen.get(process.pid, 0.0)
+            self._cpu_seen[process.pid] = cpu
+        return total_rss, renderer_rss, cpu_delta
+
+    async def _run(self):
+        while True:
+            total_rss, renderer_rss, cpu_delta = await asyncio.to_thread(self.sample)
+            if total_rss:
+                self.monitor.record_resource_sample(total_rss, renderer_rss, cpu_delta)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling, taking a final sample so short last phases are covered"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        total_rss, renderer_rss, cpu_delta = await asyncio.to_thread(self.sample)
+        if total_rss:
+            self.monitor.record_resource_sample(total_rss, renderer_rss, cpu_delta)
@@ -0,0 +1,198 @@
+# src/retry_policy.py - Retry policies and circuit breakers for flow steps
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from src.deadline import BudgetExceeded
+
+# Playwright error text that means the page/context/browser is gone for good
+FATAL_MESSAGES = (
+    'has been closed',
+    'Target closed',
+    'Browser closed',
+    'Connection closed',
+)
+
+# Transient network failures reported by Chromium
+RETRYABLE_MESSAGES = (
+    'net::ERR_',
+    'ECONNRESET',
+    'ECONNREFUSED',
+    'socket hang up',
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+    def __init__(self, endpoint):
+        super().__init__(f"Circuit open for {endpoint}")
+        self.endpoint = endpoint
+
+
+class StepFailed(Exception):
+    """Raised by attempts that failed softly (e.g. a form never appeared); always retryable"""
+
+
+def endpoint_of(url: str) -> str:
+    """Circuit breaker key of a URL: origin and path, without query or fragment"""
+    parsed = urlparse(url)
+    return f"{parsed.netloc}{parsed.path or '/'}"
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Classify an error as retryable (transient) or fatal"""
+    if isinstance(error, (BudgetExceeded, CircuitOpenError, asyncio.CancelledError)):
+        return False
+    if isinstance(error, (StepFailed, PlaywrightTimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    message = str(error)
+    if isinstance(error, PlaywrightError):
+        if any(text in message for text in FATAL_MESSAGES):
+            return False
+        return any(text in message for text in RETRYABLE_MESSAGES)
+    return isinstance(error, OSError)
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 2
+    base_delay: float = 0.2            # Seconds before the first retry
+    max_delay: float = 1.0             # Cap of the exponential backoff
+    jitter: float = 0.5                # Fraction of the delay randomized away
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based), exponential with jitter"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * (1 - self.jitter * random.random())
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint after repeated failures until a cool-down has passed.
+
+    After the cool-down the circuit is half-open: one trial call goes
+    through, and every other call is refused until that trial is recorded
+    as a success (closed) or a failure (open again).
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Closed circuits let every call through, half-open ones a single trial call"""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'open' or self.trial_in_flight:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def release(self):
+        """Give up a trial call that ended without a verdict (skipped, out of budget, cancelled)"""
+        self.trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.trial_in_flight = False
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+
+class Retrier:
+    """Runs flow steps under their retry policy, with per-endpoint circuit breakers.
+
+    Every retry is counted on the monitor as `retries.<step>`, and on the
+    running span as `retries.<step>` too.
+    """
+
+    def __init__(self, policies: Dict[str, dict], breaker_config: Optional[dict] = None, monitor=None):
+        self.policies = {step: RetryPolicy(**config) for step, config in policies.items()}
+        self.breaker_config = breaker_config or {}
+        self.monitor = monitor
+        self.deadline = None
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def policy(self, step: str) -> RetryPolicy:
+        return self.policies.get(step) or self.policies.get('default') or RetryPolicy()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(**self.breaker_config)
+        return self.breakers[endpoint]
+
+    def _count(self, name: str):
+        if self.monitor:
+            self.monitor.count(name)
+
+    async def run(self, step: str, attempt_fn: Callable, endpoint: Optional[Callable] = None):
+        """Call `attempt_fn(attempt)` until it succeeds, fails fatally or runs out of attempts.
+
+        `endpoint(attempt)` names the endpoint an attempt talks to, so a
+        failing endpoint's breaker can open and later attempts skip it.
+        """
+        policy = self.policy(step)
+        last_error = None
+        tries = 0
+        for attempt in range(1, policy.max_attempts + 1):
+            name = endpoint(attempt) if endpoint else None
+            breaker = self.breaker(name) if name else None
+            if breaker and not breaker.allow():
+                print(f"⛔ Circuit open for {name}, skipping")
+                self._count(f"circuit_open.{step}")
+                last_error = CircuitOpenError(name)
+                continue
+            # Set only when this attempt is a half-open circuit's trial call
+            trial = breaker is not None and breaker.trial_in_flight
+            try:
+                if tries:
+                    delay = policy.backoff(tries)
+                    if self.deadline:
+                        # Not worth retrying when the backoff alone would use up the step
+                        if self.deadline.step_remaining() <= delay:
+                            break
+                        delay = self.deadline.clamp_seconds(delay)
+                    self._count(f"retries.{step}")
+                    await asyncio.sleep(delay)
+                tries += 1
+                try:
+                    result = await attempt_fn(attempt)
+                except Exception as e:
+                    if breaker and not isinstance(e, BudgetExceeded):
+                        breaker.record_failure()
+                    if not is_retryable(e):
+                        raise
+                    print(f"🔁 {step} attempt {attempt}/{policy.max_attempts} failed: {e}")
+                    last_error = e
+                    continue
+                if breaker:
+                    breaker.record_success()
+                return result
+            finally:
+                # A trial that was neither a success nor a failure must not keep the circuit shut
+                if trial:
+                    breaker.release()
+        raise last_error or StepFailed(f"{step} failed")
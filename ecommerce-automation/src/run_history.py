@@ -0,0 +1,182 @@
+# src/run_history.py - Every run's phase spans and outcome in a local SQLite database, with trend queries
+import json
+import math
+import os
+import platform
+import socket
+import sqlite3
+import sys
+import time
+from importlib import metadata
+from typing import Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,           -- Unix time
+    product_url TEXT,
+    platform TEXT,
+    profile TEXT,
+    status TEXT NOT NULL,
+    failed_step TEXT,
+    total_seconds REAL,
+    counters TEXT,                      -- JSON
+    options TEXT,                       -- JSON
+    environment TEXT                    -- JSON
+);
+CREATE TABLE IF NOT EXISTS spans (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    offset_seconds REAL NOT NULL,       -- From the first span of the run
+    seconds REAL NOT NULL,
+    success INTEGER NOT NULL,
+    error TEXT,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS spans_phase ON spans(phase);
+"""
+
+BUCKET_FORMATS = {'day': '%Y-%m-%d', 'week': '%Y-W%W', 'month': '%Y-%m'}
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def environment() -> Dict[str, str]:
+    """Where a run happened, so drift can be told apart from a machine or library change"""
+    try:
+        playwright_version = metadata.version('playwright')
+    except metadata.PackageNotFoundError:
+        playwright_version = None
+    return {
+        'hostname': socket.gethostname(),
+        'os': platform.platform(),
+        'python': platform.python_version(),
+        'playwright': playwright_version,
+        'ci': bool(os.getenv('CI')),
+        'tty': sys.stdin.isatty(),
+    }
+
+
+class RunHistory:
+    """Append-only store of checkout runs; one row per run, one per recorded phase span.
+
+    Opens a connection per call, so it can be used from worker threads
+    (asyncio.to_thread) and from several processes writing to the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute('PRAGMA foreign_keys = ON')
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record(self, monitor, result: dict, product_url: str, platform_name: Optional[str],
+               profile: str, options: dict, started_at: Optional[float] = None) -> int:
+        """Store one finished run from its monitor and result dict; returns the run id"""
+        metrics = monitor.metrics
+        first_start = min((metric.start_time for metric in metrics), default=0.0)
+        connection = self._connect()
+        try:
+            with connection:
+                cursor = connection.execute(
+                    'INSERT INTO runs (started_at, product_url, platform, profile, status, failed_step, '
+                    'total_seconds, counters, options, environment) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (started_at if started_at is not None else time.time(), product_url, platform_name, profile,
+                     result.get('status'), result.get('failed_step'), monitor.get_total_time(),
+                     json.dumps(monitor.counters), json.dumps(options, default=str), json.dumps(environment()))
+                )
+                run_id = cursor.lastrowid
+                connection.executemany(
+                    'INSERT INTO spans (run_id, seq, phase, offset_seconds, seconds, success, error) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [(run_id, seq, metric.operation, metric.start_time - first_start, metric.duration,
+                      int(metric.success), metric.error) for seq, metric in enumerate(metrics)]
+                )
+            return run_id
+        finally:
+            connection.close()
+
+    def _where(self, since: Optional[float], platform_name: Optional[str], profile: Optional[str]) -> Tuple[str, list]:
+        clauses, params = [], []
+        if since is not None:
+            clauses.append('runs.started_at >= ?')
+            params.append(since)
+        if platform_name:
+            clauses.append('runs.platform = ?')
+            params.append(platform_name)
+        if profile:
+            clauses.append('runs.profile = ?')
+            params.append(profile)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def phase_trends(self, since=None, bucket='day', platform_name=None, profile=None) -> List[dict]:
+        """Per (period, phase) count, p50 and p95 of successful spans, oldest period first"""
+        where, params = self._where(since, platform_name, profile)
+        where += (' AND' if where else ' WHERE') + ' spans.success = 1'
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                'SELECT runs.started_at, spans.phase, spans.seconds FROM spans '
+                'JOIN runs ON runs.id = spans.run_id' + where, params
+            ).fetchall()
+        finally:
+            connection.close()
+        grouped: Dict[Tuple[str, str], List[float]] = {}
+        for started_at, phase, seconds in rows:
+            period = time.strftime(BUCKET_FORMATS[bucket], time.localtime(started_at))
+            grouped.setdefault((period, phase), []).append(seconds)
+        return [{'period': period, 'phase': phase, 'count': len(values),
+                 'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95)}
+                for (period, phase), values in sorted(grouped.items())]
+
+    def failure_rates(self, since=None, platform_name=None, profile=None) -> List[dict]:
+        """Per step: how often it ran, how often it failed, and how many runs it ended; worst first"""
+        where, params = self._where(since, platform_name, profile)
+        connection = self._connect()
+        try:
+            spans = connection.execute(
+                'SELECT spans.phase, COUNT(*), SUM(1 - spans.success) FROM spans '
+                'JOIN runs ON runs.id = spans.run_id' + where + ' GROUP BY spans.phase', params
+            ).fetchall()
+            ended = dict(connection.execute(
+                'SELECT failed_step, COUNT(*) FROM runs' + where +
+                (' AND' if where else ' WHERE') + ' failed_step IS NOT NULL GROUP BY failed_step', params
+            ).fetchall())
+        finally:
+            connection.close()
+        rates = [{'step': phase, 'runs': total, 'failures': failures, 'rate': failures / total,
+                  'ended_runs': ended.get(phase, 0)} for phase, total, failures in spans]
+        return sorted(rates, key=lambda row: row['rate'], reverse=True)
+
+    def slowest_runs(self, limit=10, since=None, platform_name=None, profile=None) -> List[dict]:
+        """Slowest runs by total time, each with its slowest phase"""
+        where, params = self._where(since, platform_name, profile)
+        connection = self._connect()
+        try:
+            runs = connection.execute(
+                'SELECT id, started_at, product_url, profile, status, failed_step, total_seconds FROM runs'
+                + where + ' ORDER BY total_seconds DESC LIMIT ?', params + [limit]
+            ).fetchall()
+            slowest = []
+            for run_id, started_at, product_url, run_profile, status, failed_step, total in runs:
+                phase = connection.execute(
+                    'SELECT phase, seconds FROM spans WHERE run_id = ? ORDER BY seconds DESC LIMIT 1', (run_id,)
+                ).fetchone()
+                slowest.append({
+                    'id': run_id, 'started_at': started_at, 'product_url': product_url, 'profile': run_profile,
+                    'status': status, 'failed_step': failed_step, 'total_seconds': total,
+                    'slowest_phase': phase[0] if phase else None, 'slowest_phase_seconds': phase[1] if phase else None,
+                })
+            return slowest
+        finally:
+            connection.close()
@@ -0,0 +1,66 @@
+# src/session_store.py - Authenticated session state, encrypted at rest
+import json
+import os
+from typing import Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+
+class SessionStore:
+    """Saves and loads a Playwright storage state (cookies + localStorage) encrypted with Fernet.
+
+    The key comes from the environment, never from disk next to the state, so
+    a copied state file is useless on its own. Generate one with
+    `python -c "from src.session_store import SessionStore; print(SessionStore.generate_key())"`.
+    """
+
+    def __init__(self, path: str, key: Optional[str]):
+        self.path = path
+        self.key = key
+        self._fernet = None
+        self._key_checked = False
+
+    @staticmethod
+    def generate_key() -> str:
+        return Fernet.generate_key().decode()
+
+    @property
+    def fernet(self) -> Optional[Fernet]:
+        """Built on first use, so a bad key only matters to runs that use saved sessions"""
+        if not self._key_checked:
+            self._key_checked = True
+            if self.key:
+                try:
+                    self._fernet = Fernet(self.key.encode() if isinstance(self.key, str) else self.key)
+                except (ValueError, TypeError) as e:
+                    print(f"⚠️ SESSION_STATE_KEY is not a valid Fernet key ({e}), saved sessions disabled")
+        return self._fernet
+
+    @property
+    def enabled(self) -> bool:
+        return self.fernet is not None
+
+    def save(self, state: dict):
+        """Encrypt and write a storage state; the file is only readable by its owner"""
+        if not self.enabled:
+            print("⚠️ No session state key set, not saving session state")
+            return
+        token = self.fernet.encrypt(json.dumps(state).encode('utf-8'))
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Write then rename, so a crash never leaves a truncated state behind
+        temp_path = f"{self.path}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(token)
+        os.replace(temp_path, self.path)
+
+    def load(self) -> Optional[dict]:
+        """Decrypted storage state, or None when missing, unreadable or encrypted with another key"""
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                return json.loads(self.fernet.decrypt(f.read()))
+        except (OSError, ValueError, InvalidToken) as e:
+            print(f"⚠️ Saved session state unusable: {e.__class__.__name__}")
+            return None
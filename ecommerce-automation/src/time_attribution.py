@@ -0,0 +1,123 @@
+# src/time_attribution.py - Splits each flow step's wall time into where it actually went
+import contextvars
+from typing import Dict, List, Optional, Tuple
+
+from performance_monitor import IDLE_PHASE
+
+LAUNCH = 'launch'                  # Browser and context startup
+NAVIGATION = 'navigation'          # Page loads and HTTP requests
+SLEEP = 'sleep'                    # Fixed pauses
+FAILED_PROBE = 'failed_probe'      # Selector waits/checks that found nothing
+INTERACTION = 'interaction'        # Successful waits, clicks and typing
+OVERHEAD = 'overhead'              # Python and untracked calls: the rest of the step
+CATEGORIES = (LAUNCH, NAVIGATION, SLEEP, FAILED_PROBE, INTERACTION, OVERHEAD)
+
+# Time lost to these could be cut without changing what the flow achieves
+AVOIDABLE = (SLEEP, FAILED_PROBE)
+
+_open_entries = contextvars.ContextVar('open_ledger_entries', default=())
+
+
+class LedgerEntry:
+    """Times one browser operation; nested entries' time is subtracted, so categories never overlap.
+
+    Callers may change `category` before the block ends, e.g. a selector
+    wait that turned out to be a failed probe. Without a ledger it does nothing.
+    `attributes` (selector, url) are only kept when the ledger keeps spans.
+    """
+
+    def __init__(self, ledger, category: str, detail: Optional[str] = None, attributes: Optional[dict] = None):
+        self.ledger = ledger
+        self.category = category
+        self.detail = detail
+        self.attributes = attributes or {}
+        self.child_seconds = 0.0
+        self.parent = None
+        self.error = None
+        self._token = None
+
+    def __enter__(self):
+        if self.ledger:
+            self.started = self.ledger.clock()
+            parents = _open_entries.get()
+            self.parent = parents[-1] if parents else None
+            self._token = _open_entries.set(parents + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if not self.ledger:
+            return False
+        self.ended = self.ledger.clock()
+        elapsed = self.ended - self.started
+        _open_entries.reset(self._token)
+        if self.parent:
+            self.parent.child_seconds += elapsed
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.ledger.record(self.category, max(0.0, elapsed - self.child_seconds), self.detail)
+        if self.ledger.spans is not None:
+            self.ledger.spans.append(self)
+        return False
+
+
+class TimeLedger:
+    """Per-phase time split into CATEGORIES, fed by AdvancedBrowserManager.
+
+    Steps that run operations concurrently (login racing) can account more
+    time than their wall time; overhead is then reported as zero. With
+    `keep_spans`, every finished entry is also kept in `spans` for tracing.
+    """
+
+    def __init__(self, monitor, keep_spans: bool = False):
+        self.monitor = monitor
+        self.clock = monitor.clock
+        self.spans: Optional[List[LedgerEntry]] = [] if keep_spans else None
+        # phase -> category -> seconds, and (phase, category, detail) -> seconds
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self.details: Dict[Tuple[str, str, Optional[str]], float] = {}
+
+    def track(self, category: str, detail: Optional[str] = None, attributes: Optional[dict] = None) -> LedgerEntry:
+        return LedgerEntry(self, category, detail, attributes)
+
+    def record(self, category: str, seconds: float, detail: Optional[str] = None):
+        phase = self.monitor.current_operation or IDLE_PHASE
+        by_category = self.totals.setdefault(phase, {})
+        by_category[category] = by_category.get(category, 0.0) + seconds
+        key = (phase, category, detail)
+        self.details[key] = self.details.get(key, 0.0) + seconds
+
+    def by_phase(self) -> Dict[str, Dict[str, float]]:
+        """{phase: {category: seconds}} for every recorded phase, overhead included"""
+        report = {}
+        for phase, duration in self.monitor.get_phase_durations().items():
+            tracked = self.totals.get(phase, {})
+            row = {category: tracked.get(category, 0.0) for category in CATEGORIES if category != OVERHEAD}
+            row[OVERHEAD] = max(0.0, duration - sum(row.values()))
+            report[phase] = row
+        return report
+
+    def avoidable_chunks(self, limit: int = 5, min_seconds: float = 0.05) -> List[Tuple[str, str, str, float]]:
+        """Largest (phase, category, detail, seconds) chunks of sleeps and failed probes"""
+        chunks = [(phase, category, detail or '', seconds)
+                  for (phase, category, detail), seconds in self.details.items()
+                  if category in AVOIDABLE and seconds >= min_seconds]
+        return sorted(chunks, key=lambda chunk: chunk[3], reverse=True)[:limit]
+
+    def print_report(self):
+        report = self.by_phase()
+        if not report:
+            return
+        print("\n" + "="*104)
+        print("🔬 TIME ATTRIBUTION (seconds)")
+        print("="*104)
+        print(f"{'Phase':<20}" + ''.join(f"{category:>14}" for category in CATEGORIES))
+        for phase, row in report.items():
+            print(f"{phase:<20}" + ''.join(f"{row[category]:>14.3f}" for category in CATEGORIES))
+        totals = {category: sum(row[category] for row in report.values()) for category in CATEGORIES}
+        print(f"{'all steps':<20}" + ''.join(f"{totals[category]:>14.3f}" for category in CATEGORIES))
+        chunks = self.avoidable_chunks()
+        if chunks:
+            print(f"\n✂️ Largest avoidable chunks:")
+            for phase, category, detail, seconds in chunks:
+                print(f"  - {seconds:.2f}s {category} in {phase}: {detail}")
+        print("="*104)
@@ -0,0 +1,142 @@
+# src/trace_export.py - Flow phases and browser operations as an OpenTelemetry (OTLP JSON) trace
+import json
+import os
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+from performance_monitor import IDLE_PHASE
+from src.time_attribution import FAILED_PROBE
+
+SERVICE_NAME = 'ecommerce-automation'
+SPAN_KIND_INTERNAL = 1
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def _nanos(seconds: float) -> str:
+    # OTLP JSON carries 64-bit integers as decimal strings
+    return str(int(seconds * 1_000_000_000))
+
+
+def _value(value) -> Optional[dict]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    if isinstance(value, str):
+        return {'stringValue': value}
+    if value is None:
+        return None
+    return {'stringValue': json.dumps(value, default=str)}
+
+
+def _attributes(attributes: Dict) -> List[dict]:
+    encoded = []
+    for key, value in attributes.items():
+        value = _value(value)
+        if value is not None:
+            encoded.append({'key': key, 'value': value})
+    return encoded
+
+
+def _span(trace_id, span_id, parent_id, name, start, end, attributes, error=None) -> dict:
+    span = {
+        'traceId': trace_id,
+        'spanId': span_id,
+        'name': name,
+        'kind': SPAN_KIND_INTERNAL,
+        'startTimeUnixNano': _nanos(start),
+        'endTimeUnixNano': _nanos(end),
+        'attributes': _attributes(attributes),
+        'status': {'code': STATUS_ERROR, 'message': error} if error else {'code': STATUS_OK},
+    }
+    if parent_id:
+        span['parentSpanId'] = parent_id
+    return span
+
+
+def retry_count(attributes: Dict) -> int:
+    """Retries counted on a span as retries.<step> attributes"""
+    return sum(value for key, value in attributes.items() if key.startswith('retries.') and isinstance(value, int))
+
+
+def build_trace(monitor, entries, root_name: str, root_attributes: Dict, error: Optional[str] = None) -> dict:
+    """One trace: a root span, a child per monitor phase and a grandchild per time ledger entry.
+
+    Ledger entries are parented to the entry they were nested in, otherwise
+    to the phase whose time window contains them, otherwise to the root.
+    """
+    trace_id = _new_id(16)
+    root_id = _new_id(8)
+    starts = [metric.start_time for metric in monitor.metrics] + [entry.started for entry in entries]
+    ends = [metric.end_time for metric in monitor.metrics] + [entry.ended for entry in entries]
+    if not starts:
+        return {'resourceSpans': []}
+    platform = root_attributes.get('platform')
+    spans = [_span(trace_id, root_id, None, root_name, min(starts), max(ends),
+                   {**root_attributes, 'retry_count': sum(value for name, value in monitor.counters.items()
+                                                          if name.startswith('retries.'))}, error)]
+    phases = []
+    for metric in monitor.metrics:
+        phase_id = _new_id(8)
+        phases.append((metric, phase_id))
+        attributes = {'flow.phase': metric.operation, 'platform': platform,
+                      'retry_count': retry_count(metric.attributes)}
+        attributes.update({f"flow.{key}": value for key, value in metric.attributes.items()
+                           if not isinstance(value, (list, dict))})
+        spans.append(_span(trace_id, phase_id, root_id, metric.operation, metric.start_time, metric.end_time,
+                           attributes, metric.error if not metric.success else None))
+
+    def phase_of(entry):
+        for metric, phase_id in phases:
+            if metric.start_time <= entry.started and entry.ended <= metric.end_time:
+                return metric.operation, phase_id
+        return IDLE_PHASE, root_id
+
+    entry_ids = {id(entry): _new_id(8) for entry in entries}
+    for entry in entries:
+        phase, phase_id = phase_of(entry)
+        parent_id = entry_ids.get(id(entry.parent), phase_id) if entry.parent else phase_id
+        attributes = {'flow.phase': phase, 'flow.category': entry.category, 'platform': platform,
+                      **entry.attributes}
+        attributes.setdefault('retry_count', 0)
+        error = entry.error or ('nothing matched' if entry.category == FAILED_PROBE else None)
+        spans.append(_span(trace_id, entry_ids[id(entry)], parent_id, entry.detail or entry.category,
+                           entry.started, entry.ended, attributes, error))
+    return {'resourceSpans': [{
+        'resource': {'attributes': _attributes({'service.name': SERVICE_NAME})},
+        'scopeSpans': [{'scope': {'name': SERVICE_NAME}, 'spans': spans}],
+    }]}
+
+
+class TraceExporter:
+    """Writes OTLP JSON traces to a directory, or posts them to a collector's /v1/traces"""
+
+    def __init__(self, directory: str, endpoint: Optional[str] = None, timeout: float = 5.0):
+        self.directory = directory
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, trace: dict) -> str:
+        """Blocking; returns where the trace went"""
+        body = json.dumps(trace).encode('utf-8')
+        if self.endpoint:
+            request = urllib.request.Request(self.endpoint, data=body, method='POST',
+                                             headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+            return self.endpoint
+        os.makedirs(self.directory, exist_ok=True)
+        spans = trace['resourceSpans'][0]['scopeSpans'][0]['spans'] if trace['resourceSpans'] else []
+        trace_id = spans[0]['traceId'] if spans else _new_id(16)
+        path = os.path.join(self.directory, f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{trace_id[:8]}.json")
+        with open(path, 'wb') as f:
+            f.write(body)
+        return path
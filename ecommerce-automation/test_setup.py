@@ -44,6 +44,20 @@ def test_imports():
         print(f"❌ Pillow: {e}")
         return False
     
+    try:
+        import psutil
+        print("✅ psutil")
+    except ImportError as e:
+        print(f"❌ psutil: {e}")
+        return False
+    
+    try:
+        import cryptography
+        print("✅ cryptography")
+    except ImportError as e:
+        print(f"❌ cryptography: {e}")
+        return False
+    
     return True
 
 def test_local_imports():
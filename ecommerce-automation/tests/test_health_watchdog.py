@@ -0,0 +1,383 @@
+# tests/test_health_watchdog.py - Watchdog detection and escalation, and how the flow resumes after a recovery
+import asyncio
+import time
+
+import pytest
+
+from main import ReliableEcommerceAutomation
+from performance_monitor import PerformanceMonitor
+from src.browser_manager import AdvancedBrowserManager
+from src.health_watchdog import BrowserWatchdog
+from src.network_recorder import NetworkRecorder
+from src.retry_policy import StepFailed
+
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def storage_state(self):
+        return {'cookies': [], 'origins': []}
+
+    async def close(self):
+        pass
+
+
+class FakePage:
+    def __init__(self, context=None, hang=False):
+        self.context = context or FakeContext()
+        self.handlers = {}
+        self.closed = False
+        self.hang = hang
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        if self.hang:
+            await asyncio.sleep(100)
+        return 1
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def add_init_script(self, script):
+        pass
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        return FakeContext()
+
+
+class FakeManager:
+    """Stands in for AdvancedBrowserManager; `failing` levels raise instead of recovering"""
+
+    def __init__(self, persistent=False):
+        self.page = FakePage()
+        self.browser = FakeBrowser()
+        self.launch_options = {'persistent': persistent}
+        self.levels = []
+        self.failing = set()
+
+    async def recover(self, level):
+        self.levels.append(level)
+        if level in self.failing:
+            raise RuntimeError(f"{level} recovery failed")
+        context = self.page.context if level == 'page' else FakeContext()
+        self.page = FakePage(context)
+        self.browser = FakeBrowser()
+        return self.page
+
+
+def watchdog_for(manager, **options):
+    settings = {'interval': 0.01, 'probe_timeout': 0.01, 'hung_after': 2}
+    return BrowserWatchdog(manager, PerformanceMonitor(clock=time.monotonic), **{**settings, **options})
+
+
+def test_healthy_page_needs_no_recovery():
+    async def run():
+        watchdog = watchdog_for(FakeManager())
+        return await watchdog.check()
+    assert asyncio.run(run()) is None
+
+
+def test_crashed_closed_and_disconnected_are_detected():
+    async def run():
+        manager = FakeManager()
+        watchdog = watchdog_for(manager)
+        found = []
+        await watchdog.check()
+        manager.page.handlers['crash'](manager.page)
+        found.append(await watchdog.check())
+        manager.page = FakePage()
+        manager.page.closed = True
+        found.append(await watchdog.check())
+        manager.browser.connected = False
+        found.append(await watchdog.check())
+        return found
+    assert asyncio.run(run()) == ['page_crashed', 'page_closed', 'browser_disconnected']
+
+
+def test_hang_needs_consecutive_timed_out_probes():
+    async def run():
+        manager = FakeManager()
+        manager.page.hang = True
+        watchdog = watchdog_for(manager)
+        return [await watchdog.check(), await watchdog.check()]
+    assert asyncio.run(run()) == [None, 'page_hung']
+
+
+def test_failed_level_escalates_and_persistent_profile_skips_context():
+    async def run(persistent):
+        manager = FakeManager(persistent=persistent)
+        manager.failing = {'page'}
+        recovery = await watchdog_for(manager).recover('page_crashed')
+        return manager.levels, recovery
+    levels, recovery = asyncio.run(run(False))
+    assert levels == ['page', 'context'] and recovery.level == 'context' and recovery.success
+    levels, recovery = asyncio.run(run(True))
+    assert levels == ['page', 'browser'] and recovery.level == 'browser'
+
+
+def test_watch_loop_recovers_and_reports():
+    async def run():
+        manager = FakeManager()
+        watchdog = watchdog_for(manager)
+        reported = []
+        watchdog.on_recovery.append(reported.append)
+        watchdog.start()
+        await asyncio.sleep(0.03)
+        manager.browser.connected = False
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+        return manager.levels, reported
+    levels, reported = asyncio.run(run())
+    assert levels == ['browser']
+    assert [recovery.problem for recovery in reported] == ['browser_disconnected']
+
+
+class FakeCaptchaHandler:
+    page = None
+
+
+def automation_with(manager_page, watchdog_levels_fail=()):
+    """A flow whose browser manager recovers through FakeManager's logic"""
+    manager = AdvancedBrowserManager()
+    manager.page = manager_page
+    manager.browser = FakeBrowser()
+    fake = FakeManager()
+    fake.page, fake.failing = manager_page, set(watchdog_levels_fail)
+
+    async def recover(level):
+        page = await fake.recover(level)
+        manager.page = page
+        return page
+    manager.recover = recover
+    automation = ReliableEcommerceAutomation(options={'health_watchdog': True}, browser_manager=manager,
+                                             monitor=PerformanceMonitor(clock=time.monotonic))
+    automation.result = {'failed_step': None}
+    return automation, manager
+
+
+def test_recovery_restarts_the_running_step_on_the_new_page():
+    async def run():
+        first_page = FakePage()
+        automation, manager = automation_with(first_page)
+        automation.network_recorder = NetworkRecorder(automation.monitor)
+        automation.network_recorder.attach(first_page.context)
+        captcha_handler = FakeCaptchaHandler()
+        automation.start_watchdog(captcha_handler)
+        pages = []
+
+        async def step(page):
+            pages.append(page)
+            if page is first_page:
+                await asyncio.sleep(100)  # Stuck on the page that is about to be replaced
+            return page
+
+        running = asyncio.ensure_future(automation._run_phase('add_to_cart', lambda: step(manager.page)))
+        await asyncio.sleep(0.01)
+        # A relaunched browser gives the new page a context the recorder has not seen
+        result = await automation.watchdog.recover('browser_disconnected')
+        page = await running
+        await automation.watchdog.stop()
+        return first_page, pages, page, captcha_handler, automation, result
+    first_page, pages, page, captcha_handler, automation, recovery = asyncio.run(run())
+    assert recovery.success
+    assert pages == [first_page, page] and page is not first_page
+    assert captcha_handler.page is page
+    assert 'request' in page.context.handlers
+    assert automation.result['failed_step'] is None
+
+
+def test_unrecoverable_browser_fails_the_step():
+    async def run():
+        automation, manager = automation_with(FakePage(), watchdog_levels_fail=('page', 'context', 'browser'))
+        automation.start_watchdog(FakeCaptchaHandler())
+
+        async def step():
+            await asyncio.sleep(100)
+
+        running = asyncio.ensure_future(automation._run_phase('checkout', step))
+        await asyncio.sleep(0.01)
+        await automation.watchdog.recover('page_crashed')
+        try:
+            with pytest.raises(StepFailed):
+                await running
+        finally:
+            await automation.watchdog.stop()
+        return automation.result
+    assert asyncio.run(run())['failed_step'] == 'checkout'
+
+
+def test_restarted_pipelined_checkout_falls_back_to_the_cart_page():
+    async def run():
+        first_page = FakePage()
+        automation, manager = automation_with(first_page)
+        automation.start_watchdog(FakeCaptchaHandler())
+        calls = []
+
+        async def cart_check():
+            await asyncio.sleep(100)  # Still reading the cart when the page crashes
+
+        async def checkout(page, captcha_handler, cart_confirmed=False):
+            calls.append(('checkout', page, cart_confirmed))
+            if page is first_page:
+                await asyncio.sleep(100)
+            return 'https://example.test/checkout'
+
+        async def open_cart(page):
+            calls.append(('open_cart', page))
+            return True
+        automation.checkout, automation.open_cart = checkout, open_cart
+        automation.cart_check = pending = asyncio.ensure_future(cart_check())
+        running = asyncio.ensure_future(automation._run_phase(
+            'checkout', lambda: automation.checkout_while_verifying(manager.page, FakeCaptchaHandler())))
+        await asyncio.sleep(0.01)
+        await automation.watchdog.recover('page_crashed')
+        url = await running
+        await automation.watchdog.stop()
+        return first_page, manager.page, calls, url, pending
+    first_page, page, calls, url, pending = asyncio.run(run())
+    assert url == 'https://example.test/checkout'
+    assert calls == [('checkout', first_page, True), ('open_cart', page), ('checkout', page, False)]
+    assert pending.cancelled()
+
+
+@pytest.mark.parametrize('in_cart, clicks', [(True, 1), (False, 2)])
+def test_restarted_add_to_cart_checks_the_cart_before_clicking_again(in_cart, clicks):
+    async def run():
+        first_page = FakePage()
+        automation, manager = automation_with(first_page)
+        automation.platform = 'amazon'
+        automation.options['optimistic_checkout'] = False
+        automation.start_watchdog(FakeCaptchaHandler())
+        clicked, landed = [], asyncio.Event()
+
+        async def click_add_to_cart_button(captcha_handler):
+            clicked.append(manager.page)
+            landed.set()
+            return True
+
+        async def verify_cart_addition(page):
+            if page is first_page:
+                await asyncio.sleep(100)  # The page hangs after the click landed
+            return True
+
+        async def cart_holds(product_id):
+            return in_cart
+
+        async def open_product_page(product_url):
+            return True
+        automation.click_add_to_cart_button = click_add_to_cart_button
+        automation.verify_cart_addition = verify_cart_addition
+        automation.cart_holds, automation.open_product_page = cart_holds, open_product_page
+        running = asyncio.ensure_future(automation._run_phase('add_to_cart', lambda: automation.add_to_cart(
+            manager.page, 'https://www.amazon.in/dp/B0TEST0001', FakeCaptchaHandler())))
+        await landed.wait()
+        await automation.watchdog.recover('page_hung')
+        added = await running
+        await automation.watchdog.stop()
+        return added, clicked
+    added, clicked = asyncio.run(run())
+    assert added and len(clicked) == clicks
+
+
+def test_deadline_during_a_pending_recovery_is_not_swallowed():
+    async def run():
+        automation, manager = automation_with(FakePage())
+        automation.start_watchdog(FakeCaptchaHandler())
+        started = asyncio.Event()
+
+        async def step():
+            started.set()
+            await asyncio.sleep(100)
+
+        running = asyncio.ensure_future(asyncio.wait_for(automation._await_step(step), timeout=0.05))
+        await started.wait()
+        automation.interrupt_step()  # The recovery never finishes
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await running
+        finally:
+            await automation.watchdog.stop()
+        return automation
+    automation = asyncio.run(run())
+    assert automation.step_interruption is None and automation.step_task is None
+
+
+def test_cancel_not_from_the_watchdog_is_passed_on():
+    async def run():
+        automation, manager = automation_with(FakePage())
+        started = asyncio.Event()
+
+        async def step():
+            started.set()
+            await asyncio.sleep(100)
+
+        running = asyncio.ensure_future(automation._await_step(step))
+        await started.wait()
+        automation.step_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        return automation
+    assert asyncio.run(run()).step_interruption is None
+
+
+def test_recorder_attaches_each_context_once():
+    recorder = NetworkRecorder(PerformanceMonitor(clock=time.monotonic))
+    context = FakeContext()
+    recorder.attach(context)
+    recorder.attach(context)
+    assert len(context.handlers['request']) == 1
+
+
+def test_relaunch_and_new_context_warm_the_same_origins():
+    async def run():
+        manager = AdvancedBrowserManager()
+        manager.launch_options = {'persistent': False, 'headless': True, 'storage_state': None,
+                                  'warm_origins': ['https://example.test']}
+        manager.browser = FakeBrowser()
+        manager.context = FakeContext()
+        manager.page = FakePage(manager.context)
+        warmed = []
+
+        async def prewarm_connections(context, origins, settle=1.0):
+            warmed.append((context, origins))
+        manager.prewarm_connections = prewarm_connections
+        await manager.recycle_context()
+        await manager.prewarm_task
+        recycled = manager.context
+        launched = []
+
+        async def start_browser(*args):
+            launched.append(args)
+        manager._start_browser = start_browser
+        manager.browser = None
+        await manager.relaunch_browser()
+        return recycled, warmed, launched
+    recycled, warmed, launched = asyncio.run(run())
+    assert warmed == [(recycled, ['https://example.test'])]
+    assert launched == [(False, True, None, ['https://example.test'])]
@@ -0,0 +1,107 @@
+# tests/test_retry_policy.py - Circuit breaker states and how the retrier resolves half-open trial calls
+import asyncio
+
+import pytest
+
+from src.deadline import BudgetExceeded
+from src.retry_policy import CircuitBreaker, Retrier, StepFailed
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def opened_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_failures_open_the_circuit_until_the_cool_down():
+    clock = FakeClock()
+    breaker = opened_breaker(clock)
+    assert breaker.state == 'open' and not breaker.allow()
+    clock.now = 29.9
+    assert not breaker.allow()
+    clock.now = 30.0
+    assert breaker.state == 'half_open'
+
+
+def test_half_open_lets_one_trial_through_and_a_success_closes():
+    clock = FakeClock()
+    breaker = opened_breaker(clock)
+    clock.now = 30.0
+    assert breaker.allow()
+    assert not breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_opens_the_circuit_again():
+    clock = FakeClock()
+    breaker = opened_breaker(clock)
+    clock.now = 30.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+    clock.now = 60.0
+    assert breaker.allow() and not breaker.allow()
+
+
+def retrier_with_half_open(endpoint):
+    clock = FakeClock()
+    retrier = Retrier({'step': {'max_attempts': 1}}, {'failure_threshold': 3, 'reset_timeout': 30.0})
+    retrier.breakers[endpoint] = opened_breaker(clock)
+    clock.now = 30.0
+    return retrier, retrier.breakers[endpoint]
+
+
+def test_concurrent_calls_share_one_trial():
+    async def run():
+        retrier, breaker = retrier_with_half_open('shop.test/cart')
+        calls = []
+
+        async def attempt(number):
+            calls.append(number)
+            await asyncio.sleep(0.01)
+            return True
+        results = await asyncio.gather(*(retrier.run('step', attempt, endpoint=lambda number: 'shop.test/cart')
+                                         for _ in range(3)), return_exceptions=True)
+        return calls, results, breaker
+    calls, results, breaker = asyncio.run(run())
+    assert len(calls) == 1
+    assert results.count(True) == 1 and sum(isinstance(result, Exception) for result in results) == 2
+    assert breaker.state == 'closed'
+
+
+@pytest.mark.parametrize('error', [BudgetExceeded('step'), asyncio.CancelledError()])
+def test_trial_without_a_verdict_is_released(error):
+    async def run():
+        retrier, breaker = retrier_with_half_open('shop.test/cart')
+
+        async def attempt(number):
+            raise error
+        with pytest.raises(type(error)):
+            await retrier.run('step', attempt, endpoint=lambda number: 'shop.test/cart')
+        return breaker
+    breaker = asyncio.run(run())
+    assert breaker.state == 'half_open' and breaker.allow()
+
+
+def test_failed_trial_through_the_retrier_reopens():
+    async def run():
+        retrier, breaker = retrier_with_half_open('shop.test/cart')
+
+        async def attempt(number):
+            raise StepFailed("still down")
+        with pytest.raises(StepFailed):
+            await retrier.run('step', attempt, endpoint=lambda number: 'shop.test/cart')
+        return breaker
+    assert asyncio.run(run()).state == 'open'